@@ -1,6 +1,4 @@
 import typer 
-from invoice_db.db import customers as customers_db
-from invoice_db.db import invoices as invoices_db
 from .common import console
     
 #CLI APP
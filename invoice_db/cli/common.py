@@ -1,4 +1,4 @@
-import typer, sqlite3
+import typer
 from rich.theme import Theme
 from rich.console import Console
 from contextlib import contextmanager
@@ -17,20 +17,17 @@ THEME = Theme({
 
 console = Console(highlight=False, theme=THEME)
 
+# Shared --db option; every command takes the same default and help text.
+DB_OPTION = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+
+def close_connection(db_path: str) -> None:
+    """Close and forget the pooled connection for db_path (e.g. before deleting the file)."""
+    connection.close_pooled_connection(db_path)
+
 @contextmanager
 def get_connection(db_path: str = connection.DB_PATH):
-    connect = sqlite3.connect(db_path)
-    connect.row_factory = sqlite3.Row
-    cursor = connect.cursor()
-    cursor.execute("PRAGMA foreign_keys = ON;")
-    try:
-        yield connect, cursor
-        connect.commit()
-    except Exception:
-        connect.rollback()
-        raise
-    finally:
-        connect.close()
+    # Pooled connections are autocommit; writes go through connection.transaction().
+    yield connection.get_pooled_connection(db_path), connection.get_pooled_cursor(db_path)
 
 def db_error(e: Exception) -> None:
     console.print(f"Database error: {e}", style="error")
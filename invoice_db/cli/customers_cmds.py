@@ -1,8 +1,8 @@
-import typer, sqlite3
+import typer, sqlite3, csv
+from pathlib import Path
 from typing import Optional
 
-from invoice_db.db import customers as customers_db
-from invoice_db.db import connection
+from invoice_db.db.connection import transaction
 from . import common, render_customers, validators, require
 
 customers_app = typer.Typer(help="customer commands.")
@@ -11,13 +11,17 @@ customers_app = typer.Typer(help="customer commands.")
 def create_customer(
     customer_name: str = typer.Option(..., "-n", "--name", help="Name of the customer."),
     email: str = typer.Option(..., "-e", "--email", help="Email of the customer."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import customers as customers_db
+    validators.validate_customer_fields(customer_name, email)
+
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            customer_id = customers_db.create_customer(cursor, customer_name, email)
+            with transaction(cursor):
+                customer_id = customers_db.create_customer(cursor, customer_name, email)
 
-            customer = customers_db.get_customer_by_id(cursor, customer_id)
+                customer = customers_db.get_customer_by_id(cursor, customer_id)
 
         except ValueError as ve:
             common.console.print(f"{ve}", style="error")
@@ -27,24 +31,45 @@ def create_customer(
         
     common.console.print(f"Created customer: {customer['name']} <{customer['email']}> (id={customer['id']})", style="success")
         
+@customers_app.command("bulk-create", help="Create customers from a CSV file with name,email columns.")
+def bulk_create_customers(
+    csv_path: Path = typer.Option(..., "--from-csv", exists=True, dir_okay=False, help="CSV file with a name,email header."),
+    db_path: str = common.DB_OPTION
+):
+    from invoice_db.db import customers as customers_db
+    try:
+        with open(csv_path, newline="") as f:
+            rows = [(row["name"], row["email"]) for row in csv.DictReader(f)]
+    except KeyError as ke:
+        common.console.print(f"CSV is missing required column: {ke}", style="error")
+        raise typer.Exit(code=1)
+
+    with common.get_connection(db_path) as (connect, cursor):
+        try:
+            with transaction(cursor):
+                created = customers_db.create_customers(cursor, rows)
+
+        except ValueError as ve:
+            common.console.print(f"{ve}", style="error")
+            raise typer.Exit(code=1)
+        except sqlite3.Error as e:
+            common.db_error(e)
+
+    common.console.print(f"Created {created} customers", style="success")
+
 @customers_app.command("get", help="Get customer by id or email.")
 def get_customer(
     id: Optional[int] = typer.Option(None, "-i", "--id", help="ID of the customer"),
     email_selector: Optional[str] = typer.Option(None, "-e", "--email", help="Email of the customer"),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB")
+    db_path: str = common.DB_OPTION
 
 ):
-    if id is None and email_selector is None:
-        common.console.print("Please provide either --id or --email", style="warning")
-        raise typer.Exit(code=1)
-    
-    if id and email_selector:
-        common.console.print("Please provide only one of --id or --email (not both)", style="warning")
-        raise typer.Exit(code=1)
+    from invoice_db.db import customers as customers_db
+    validators.validate_one_of(id, email_selector, ("--id", "--email"))
     
     with common.get_connection(db_path) as (connect, cursor):
         try: 
-            if id:
+            if id is not None:
                 customer = customers_db.get_customer_by_id(cursor, id)
             else:
                 customer = customers_db.get_customer_by_email(cursor, email_selector)
@@ -55,12 +80,13 @@ def get_customer(
     if customer:
         render_customers.print_customer_summary(customer)
     else:
-        render_customers.customer_not_found(id)
+        render_customers.customer_not_found(id, email_selector)
 
 @customers_app.command("list", help="List all customers in the database.")
 def list_customers(
-        db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+        db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import customers as customers_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
             customers = customers_db.get_customers(cursor)
@@ -80,29 +106,26 @@ def update_customer(
     email_selector: Optional[str] = typer.Option(None, "-e", "--email", help="Email of the customer."),
     new_name: Optional[str] = typer.Option(None, "--name", help="Name to update customer with."),
     new_email: Optional[str] = typer.Option(None,  "--new-email", help="Email to update customer with."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import customers as customers_db
     updated_customer = None
 
-    if id is None and email_selector is None:
-        common.console.print("Please provide either --id or --email to select a customer", style="warning")
-        raise typer.Exit(code=1)
-    if id is not None and email_selector is not None:
-        common.console.print("Please provide only one of --id or --email (not both)", style="warning")
-        raise typer.Exit(code=1)
+    validators.validate_one_of(id, email_selector, ("--id", "--email"))
     if new_name is None and new_email is None:
         common.console.print("Please provide --name and/or --new-email", style="warning")
         raise typer.Exit(code=1)
     
+    validators.validate_customer_fields(new_name, new_email)
+
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            customer = require.require_customer(cursor, id, email_selector)
-            
-            validators.validate_customer_changes(customer, new_name, new_email)
-            
-            updated = customers_db.update_customer(cursor, customer['id'], new_name, new_email)
+            with transaction(cursor):
+                customer = require.require_customer(cursor, id, email_selector)
                 
-            updated_customer = customers_db.get_customer_by_id(cursor, customer['id'])
+                validators.validate_customer_changes(customer, new_name, new_email)
+                
+                updated_customer = customers_db.update_customer(cursor, customer['id'], new_name, new_email)
 
         except ValueError as ve:
             common.console.print(f"{ve}", style="error")
@@ -121,17 +144,19 @@ def update_customer(
 @customers_app.command("delete", help="Deletes a single customer in the database.")
 def delete_customer_by_id(
     customer_id: int = typer.Option(..., "-i", "--id", help="ID of the customer."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import customers as customers_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            deleted = customers_db.delete_customer(cursor=cursor, customer_id=customer_id)
+            with transaction(cursor):
+                deleted = customers_db.delete_customer(cursor=cursor, customer_id=customer_id)
 
         except sqlite3.Error as e:  
             common.db_error(e)
 
-        if not deleted:
-            common.console.print(f"Customer not found with id={customer_id}", style="error")
-            raise typer.Exit(code=1)
+    if not deleted:
+        render_customers.customer_not_found(customer_id)
+        raise typer.Exit(code=1)
 
-        common.console.print(f"Deleted customer (id={customer_id})", style="success")
+    common.console.print(f"Deleted customer (id={customer_id})", style="success")
@@ -1,11 +1,10 @@
-import typer, sqlite3
+import typer, sqlite3, csv
 from datetime import date
+from pathlib import Path
 from typing import Optional
 
-from invoice_db.db import customers as customers_db
-from invoice_db.db import invoices as invoices_db
-from invoice_db.db import connection
-from . import common, render_customers, render_invoices, validators, require
+from invoice_db.db.connection import transaction
+from . import common, render_customers, render_invoices, require
 
 invoices_app = typer.Typer(help="Invoice commands.")
 
@@ -15,19 +14,19 @@ def create_invoice(
     total: float = typer.Option(..., "-t", "--total", help="Invoice total amount."),
     date_issued: Optional[str] = typer.Option(None, "--date-issued", help="Date invoice was issued."),
     date_due: Optional[str] = typer.Option(None, "--date-due", help="Date invoice is due."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import invoices as invoices_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            require.require_customer(cursor, customer_id)
-
-            invoice_id = invoices_db.add_invoice_to_customer(
-                cursor, 
-                customer_id=customer_id, 
-                total=total,
-                date_issued=date_issued, 
-                date_due=date_due
-                )
+            with transaction(cursor):
+                invoice_id = invoices_db.add_invoice_to_customer(
+                    cursor, 
+                    customer_id=customer_id, 
+                    total=total,
+                    date_issued=date_issued, 
+                    date_due=date_due
+                    )
             
         except ValueError as ve:
             common.console.print(f"{ve}", style="error")
@@ -38,6 +37,39 @@ def create_invoice(
     common.console.print(f"Created invoice (id={invoice_id}) for customer_id={customer_id}", style="success")
 
 
+@invoices_app.command("bulk-create", help="Create draft invoices from a CSV file with customer_id,total columns.")
+def bulk_create_invoices(
+    csv_path: Path = typer.Option(..., "--from-csv", exists=True, dir_okay=False, help="CSV file with a customer_id,total header (date_issued, date_due optional)."),
+    db_path: str = common.DB_OPTION
+):
+    from invoice_db.db import invoices as invoices_db
+    try:
+        with open(csv_path, newline="") as f:
+            rows = [
+                (int(row["customer_id"]), row.get("date_issued") or None, row["total"], row.get("date_due") or None)
+                for row in csv.DictReader(f)
+            ]
+    except KeyError as ke:
+        common.console.print(f"CSV is missing required column: {ke}", style="error")
+        raise typer.Exit(code=1)
+    except (TypeError, ValueError):
+        # TypeError: DictReader fills fields missing from a short row with None.
+        common.console.print("Every CSV row needs an integer customer_id", style="error")
+        raise typer.Exit(code=1)
+
+    with common.get_connection(db_path) as (connect, cursor):
+        try:
+            with transaction(cursor):
+                created = invoices_db.bulk_add_invoices(cursor, rows)
+
+        except ValueError as ve:
+            common.console.print(f"{ve}", style="error")
+            raise typer.Exit(code=1)
+        except sqlite3.Error as e:
+            common.db_error(e)
+
+    common.console.print(f"Created {created} invoices", style="success")
+
 @invoices_app.command("list", help="List all invoices and their respective customer.")
 def list_invoices(
     customer_id: Optional[int] = typer.Option(None, "-c", "--customer-id", help="Filter by customer ID."),
@@ -48,7 +80,8 @@ def list_invoices(
     offset: int = typer.Option(0, "-o", "--offset", min=0, help="Invoices to skip."),
     sort_by: str = typer.Option("created_at", "--sort-by", help="Sort by: id | date_issued | total | status"),
     desc: bool = typer.Option(True, "--desc/--asc", help="Sort direction."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")):
+    db_path: str = common.DB_OPTION):
+    from invoice_db.db import invoices as invoices_db
     
     with common.get_connection(db_path) as (connect, cursor):
         try:
@@ -69,17 +102,18 @@ def list_invoices(
         except sqlite3.Error as e:
             common.db_error(e)
 
-        if not invoices:
-            render_invoices.no_invoices_found()
-            return
-        
-        render_invoices.print_invoices_table(invoices)
+    if not invoices:
+        render_invoices.no_invoices_found()
+        return
+    
+    render_invoices.print_invoices_table(invoices)
 
 @invoices_app.command("get", help="Get invoice by its ID.")
 def get_invoice(
     invoice_id: int = typer.Option(..., "-i", "--id", help="ID of invoice to get."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import invoices as invoices_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
             invoice = invoices_db.get_invoice_by_id(cursor, invoice_id)
@@ -87,10 +121,10 @@ def get_invoice(
         except sqlite3.Error as e:
             common.db_error(e)
 
-        if invoice:
-            render_invoices.print_invoice_table(invoice)
-        else:
-            render_invoices.invoice_not_found(invoice_id)
+    if invoice:
+        render_invoices.print_invoice_table(invoice)
+    else:
+        render_invoices.invoice_not_found(invoice_id)
             
         
 @invoices_app.command("count", help="Count number of invoices.")
@@ -99,8 +133,10 @@ def count_invoices(
     status: Optional[str] = typer.Option(None, "-s", "--status", help="Filter by: draft | sent | paid | void"),
     min_total: Optional[int] = typer.Option(None, "--min-total", help="Minimum invoice total."),
     max_total: Optional[int] = typer.Option(None, "--max-total", help="Maximum invoice total."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import customers as customers_db
+    from invoice_db.db import invoices as invoices_db
     customer = None
     count = 0
     
@@ -135,8 +171,9 @@ def overdue_invoices(
     offset: int = typer.Option(0, "-o", "--offset", min=0, help="Invoices to skip."),
     sort_by: str = typer.Option("date_issued", "--sort-by", help="Sort by: id | date_issued | total | days_overdue"),
     desc: bool = typer.Option(True, "--desc/--asc", help="Sort direction."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import invoices as invoices_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
             invoices = invoices_db.list_overdue_invoices(
@@ -169,10 +206,9 @@ def update_invoice(
     new_date_due: Optional[str] = typer.Option(None, "--date-due", help="Date to update due date."),
     new_total: Optional[float] = typer.Option(None, "--total", help="New total for the invoice."),
     new_customer: Optional[int] = typer.Option(None, "--customer", help="customer to append the invoice to."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
-    updated_invoice = None
-
+    from invoice_db.db import invoices as invoices_db
     if (
         new_date_issued is None 
         and new_date_due is None 
@@ -184,23 +220,21 @@ def update_invoice(
 
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            invoice = require.require_invoice(cursor, invoice_id)
-            validators.validate_invoice_changes(invoice, new_date_due, new_date_issued, new_total, new_customer)
-            
-            updated = invoices_db.update_invoice(
-                cursor=cursor,
-                invoice_id=invoice_id,
-                date_issued=new_date_issued,
-                date_due=new_date_due,
-                total=new_total,
-                customer_id=new_customer
-                )
-            
-            if not updated:
-                 common.console.print("No changes were applied", style="warning")
-                 raise typer.Exit(code=1)
-            
-            updated_invoice = invoices_db.get_invoice_by_id(cursor, invoice_id=invoice_id)
+            with transaction(cursor):
+                invoice = require.require_invoice(cursor, invoice_id)
+                changes = invoices_db.get_invoice_changes(
+                    invoice,
+                    date_issued=new_date_issued,
+                    date_due=new_date_due,
+                    total=new_total,
+                    customer_id=new_customer
+                    )
+                
+                if not changes:
+                    common.console.print("No changes were applied", style="warning")
+                    raise typer.Exit(code=1)
+
+                updated_invoice = invoices_db.apply_invoice_changes(cursor, invoice_id, changes)
             
         except ValueError as ve:
             common.console.print(f"{ve}", style="error")
@@ -208,52 +242,52 @@ def update_invoice(
         except sqlite3.Error as e:
             common.db_error(e)
 
-    fields = render_invoices.build_changed_fields_label(new_customer, new_date_issued, new_date_due, new_total)
-    if updated_invoice:
-        render_invoices.print_invoice_update(updated_invoice['id'], fields)
-        render_invoices.print_invoice_table(updated_invoice)
-    else:
-        common.console.print("Updated invoice, but failed to reload record.", style="error")
-        raise typer.Exit(code=1)
+    fields = render_invoices.build_changed_fields_label(changes)
+    render_invoices.print_invoice_update(updated_invoice['id'], fields)
+    render_invoices.print_invoice_table(updated_invoice)
     
 @invoices_app.command("set-status", help="Update the status of an invoice.")
 def set_status(
     invoice_id: int = typer.Option(..., "-i", "--id", help="Invoice ID."),
     status: str = typer.Option(..., "-s", "--status", help="draft | sent | paid | void"),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLITE DB."),
+    db_path: str = common.DB_OPTION,
 ):
+    from invoice_db.db import invoices as invoices_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            updated = invoices_db.set_invoice_status(cursor, invoice_id, status)
-            updated_invoice = invoices_db.get_invoice_by_id(cursor, invoice_id=invoice_id)
+            with transaction(cursor):
+                updated = invoices_db.set_invoice_status(cursor, invoice_id, status)
+                updated_invoice = invoices_db.get_invoice_by_id(cursor, invoice_id=invoice_id)
         except ValueError as ve:
             common.console.print(f"{ve}", style="error")
             raise typer.Exit(code=1)
         except sqlite3.Error as e:
             common.db_error(e)
 
-        if not updated:
-            render_invoices.invoice_not_found(invoice_id)
-            raise typer.Exit(code=1)
-        
-        common.console.print(f"Updated invoice (id={invoice_id}, status -> {status.lower()})", style="success")
-        render_invoices.print_invoice_table(updated_invoice)
+    if not updated:
+        render_invoices.invoice_not_found(invoice_id)
+        raise typer.Exit(code=1)
+    
+    common.console.print(f"Updated invoice (id={invoice_id}, status -> {status.lower()})", style="success")
+    render_invoices.print_invoice_table(updated_invoice)
 
         
 @invoices_app.command("delete", help="Deletes a single invoice from the database.")
 def delete_invoice(
     invoice_id: int = typer.Option(..., "-i", "--id", help="ID of the invoice."),
-    db_path: str = typer.Option(connection.DB_PATH, "--db", help="Path to SQLite DB.")
+    db_path: str = common.DB_OPTION
 ):
+    from invoice_db.db import invoices as invoices_db
     with common.get_connection(db_path) as (connect, cursor):
         try:
-            deleted = invoices_db.delete_invoice(cursor=cursor, invoice_id=invoice_id)
+            with transaction(cursor):
+                deleted = invoices_db.delete_invoice(cursor=cursor, invoice_id=invoice_id)
 
         except sqlite3.Error as e:
             common.db_error(e)
 
-        if not deleted:
-            render_invoices.invoice_not_found(invoice_id)
-            raise typer.Exit(code=1)
+    if not deleted:
+        render_invoices.invoice_not_found(invoice_id)
+        raise typer.Exit(code=1)
     
     common.console.print(f"Deleted invoice (id={invoice_id})", style="success")
\ No newline at end of file
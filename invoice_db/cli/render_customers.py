@@ -1,5 +1,6 @@
 from . import common
-from rich.table import Table
+
+CUSTOMER_SUMMARY_FMT = "[title]ID   NAME     EMAIL[/title]\n%-4d %-8s %s\n"
 
 def customer_not_found(customer_id: int | None = None, email: str | None = None) -> None:
     if customer_id is not None:
@@ -13,14 +14,10 @@ def no_customers_found() -> None:
     common.console.print("No customers found", style="warning")
 
 def print_customer_summary(customer: dict) -> None:
-    common.console.print("[title]ID   NAME     EMAIL[/title]")
-    common.console.print(
-        f"{customer['id']:<4} "
-        f"{customer['name']:<8} "
-        f"{customer['email']}\n"
-    )
+    common.console.print(CUSTOMER_SUMMARY_FMT % (customer['id'], customer['name'], customer['email']))
 
 def print_customers_table(customers: dict) -> None:
+    from rich.table import Table
     table = Table(title="customers")
     table.add_column("ID", justify="right")
     table.add_column("Name")
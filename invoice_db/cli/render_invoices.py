@@ -1,6 +1,8 @@
-from invoice_db.db import utils
-from . import common, render_customers
-from rich.table import Table
+from rich.text import Text
+from . import common
+
+# Prebuilt cell for empty dates, so rows skip markup parsing.
+MUTED_DASH = Text("-", style="muted")
 
 def invoice_not_found(invoice_id: int | None = None) -> None:
     if invoice_id is not None:
@@ -12,6 +14,8 @@ def no_invoices_found() -> None:
     common.console.print("No invoices found", style="warning")
 
 def print_invoice_table(invoice: dict) -> None:
+    from invoice_db.db import utils
+    from rich.table import Table
     table = Table(title=f"Invoice (id={invoice['id']})")
     table.add_column("ID", justify="right")
     table.add_column("Total", justify="right")
@@ -19,34 +23,38 @@ def print_invoice_table(invoice: dict) -> None:
     table.add_column("Due", justify="center")
     table.add_column("Status", justify="left")
 
-    due = utils.fmt_optional(invoice["date_due"])
-    issued = utils.fmt_optional(invoice["date_issued"])
-    if due == "-":
-            due = "[muted]-[/muted]"
-    if issued == "-":
-            issued = "[muted]-[/muted]"
-    table.add_row(str(invoice['id']), str(utils.fmt_dollars(invoice['total'])), issued, due, invoice['status'])
+    due = invoice["date_due"] or MUTED_DASH
+    issued = invoice["date_issued"] or MUTED_DASH
+    table.add_row(str(invoice['id']), utils.fmt_dollars(invoice['total']), issued, due, invoice['status'])
     common.console.print(table)
 
 def print_invoices_table(invoices: list) -> None:
+    from invoice_db.db import utils
+    from rich.table import Table
     table = Table(title=f"[title]Invoices[/title]")
     table.add_column("ID", justify="right")
+    table.add_column("Customer")
     table.add_column("Total", justify="right")
     table.add_column("Issued", justify="center")
     table.add_column("Due", justify="center")
     table.add_column("Status", justify="left")
 
+    # Hoist lookups out of the per-row loop.
+    add_row, fmt_dollars = table.add_row, utils.fmt_dollars
     for i in invoices:
-        due = utils.fmt_optional(i["date_due"])
-        issued = utils.fmt_optional(i["date_issued"])
-        if due == "-":
-            due = "[muted]-[/muted]"
-        if issued == "-":
-            issued = "[muted]-[/muted]"
-        table.add_row(str(i['id']), str(utils.fmt_dollars(i['total'])), issued, due, i['status'])
+        add_row(
+            str(i['id']),
+            i['customer_name'],
+            fmt_dollars(i['total']),
+            i['date_issued'] or MUTED_DASH,
+            i['date_due'] or MUTED_DASH,
+            i['status'],
+        )
     common.console.print(table)
 
 def print_invoices_table_overdue(invoices: list) -> None:
+    from invoice_db.db import utils
+    from rich.table import Table
     table = Table(title=f"[title]Overdue Invoices[/title]")
     table.add_column("ID", justify="right")
     table.add_column("Total", justify="right")
@@ -55,11 +63,16 @@ def print_invoices_table_overdue(invoices: list) -> None:
     table.add_column("Status", justify="left")
     table.add_column("Days_Overdue", justify="center")
 
+    add_row, fmt_dollars = table.add_row, utils.fmt_dollars
     for i in invoices:
-        due = utils.fmt_optional(i["date_due"])
-        if due == "-":
-            due = "[muted]-[/muted]"
-        table.add_row(str(i['id']), str(utils.fmt_dollars(i['total'])), str(i['date_issued']), due, i['status'], str(i["days_overdue"]))
+        add_row(
+            str(i['id']),
+            fmt_dollars(i['total']),
+            str(i['date_issued']),
+            i['date_due'] or MUTED_DASH,
+            i['status'],
+            str(i['days_overdue']),
+        )
     common.console.print(table)
 
 def build_count_label(
@@ -81,24 +94,8 @@ def build_count_label(
 
     return ", ".join(parts) if parts else None
 
-def build_changed_fields_label(
-        customer_id: int | None = None,
-        date_issued: str | None = None,
-        date_due: str | None = None,
-        total: int | None = None,
-) -> str | None:
-    changed_fields = []
-
-    if customer_id:
-        changed_fields.append("customer_id")
-    if date_issued:
-        changed_fields.append("date_issued")
-    if date_due:
-        changed_fields.append("date_due")
-    if total:
-        changed_fields.append("total")
-
-    return " ".join(changed_fields) if changed_fields else None
+def build_changed_fields_label(changes: dict) -> str | None:
+    return " ".join(changes) if changes else None
 
 def print_invoice_count(count: int, label: str) -> None:
     if label:
@@ -109,12 +106,3 @@ def print_invoice_count(count: int, label: str) -> None:
 def print_invoice_update(id: int, fields: str) -> None:
     if fields:
         common.console.print(f"Updated invoice (id={id}, fields: {fields})", style="success")
-
-
-def display_customer_and_invoices(customer: dict, invoices: dict) -> None:
-    render_customers.print_customer_summary(customer)
-    if invoices:
-        print_invoices_table(customer['name'], invoices)
-    else:
-        no_invoices_found()
-        print()
\ No newline at end of file
@@ -1,9 +1,8 @@
 import typer
-from invoice_db.db import customers as customers_db
-from invoice_db.db import invoices as invoices_db
 from . import render_customers, render_invoices
 
 def require_customer(cursor, customer_id: int | None = None, email: str | None = None) -> dict:
+    from invoice_db.db import customers as customers_db
     if customer_id is None and email is None:
         raise ValueError("require_customer needs customer_id or email")
     elif customer_id is not None:
@@ -18,6 +17,7 @@ def require_customer(cursor, customer_id: int | None = None, email: str | None =
         raise typer.Exit(code=1)
     
 def require_invoice(cursor, invoice_id: int) -> dict:
+    from invoice_db.db import invoices as invoices_db
     invoice = invoices_db.get_invoice_by_id(cursor=cursor, invoice_id=invoice_id)
     if invoice:
         return invoice
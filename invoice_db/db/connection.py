@@ -1,29 +1,113 @@
 import sqlite3
 from contextlib import contextmanager
+import atexit
 import os
+import threading
 
 
 DB_PATH = os.getenv("INVOICEDB_PATH", "invoicedb.sqlite")
+# UPDATE/INSERT/DELETE ... RETURNING requires SQLite 3.35+.
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+PRAGMAS = """
+    PRAGMA foreign_keys = ON;
+    PRAGMA recursive_triggers = OFF;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# Single-process, throwaway databases (e.g. tests): no locking handoff, no journal fsyncs.
+FAST_PRAGMAS = """
+    PRAGMA locking_mode = EXCLUSIVE;
+    PRAGMA journal_mode = MEMORY;
+    PRAGMA synchronous = OFF;
+"""
+
+# Process-wide pool: one connection (and one shared cursor) per db_file, reused until close_pooled_connection/exit.
+_POOL: dict[str, sqlite3.Connection] = {}
+_CURSORS: dict[str, sqlite3.Cursor] = {}
+_POOL_LOCK = threading.Lock()
 
 # HELPERS
-def open_db(db_file=DB_PATH) -> sqlite3.Connection:
-    connect = sqlite3.connect(db_file)
-    connect.execute("PRAGMA foreign_keys = ON;")
-    connect.execute("PRAGMA recursive_triggers = OFF;")
+def fast_mode_enabled() -> bool:
+    return os.getenv("INVOICEDB_FAST") == "1"
+
+def apply_pragmas(connect: sqlite3.Connection, db_file=DB_PATH, fast: bool = False) -> None:
+    """Apply connection PRAGMAs in one script; WAL only for file-backed databases."""
+    pragmas = PRAGMAS
+    if fast:
+        pragmas += FAST_PRAGMAS
+    elif db_file != ":memory:":
+        pragmas += "PRAGMA journal_mode = WAL;"
+    connect.executescript(pragmas)
+
+def open_db(db_file=DB_PATH, *, fast: bool | None = None, **connect_kwargs) -> sqlite3.Connection:
+    """Open db_file with PRAGMAs applied; fast defaults to the INVOICEDB_FAST env var."""
+    if fast is None:
+        fast = fast_mode_enabled()
+    # Keep every hot query's prepared statement; the sqlite3 default is 128.
+    connect_kwargs.setdefault("cached_statements", 256)
+    connect = sqlite3.connect(db_file, **connect_kwargs)
+    apply_pragmas(connect, db_file, fast)
     connect.row_factory = sqlite3.Row
     return connect
 
+def get_pooled_connection(db_file=DB_PATH) -> sqlite3.Connection:
+    """Return the shared autocommit connection for db_file, opening it on first use."""
+    with _POOL_LOCK:
+        connect = _POOL.get(db_file)
+        if connect is None:
+            connect = _POOL[db_file] = open_db(
+                db_file,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+        return connect
+
+def get_pooled_cursor(db_file=DB_PATH) -> sqlite3.Cursor:
+    """Return the shared cursor of db_file's pooled connection; dropped together with the connection."""
+    connect = get_pooled_connection(db_file)
+    with _POOL_LOCK:
+        cursor = _CURSORS.get(db_file)
+        if cursor is None or cursor.connection is not connect:
+            cursor = _CURSORS[db_file] = connect.cursor()
+        return cursor
+
+def close_pooled_connection(db_file=DB_PATH) -> None:
+    with _POOL_LOCK:
+        _CURSORS.pop(db_file, None)
+        connect = _POOL.pop(db_file, None)
+    if connect is not None:
+        connect.close()
+
+def close_all_pooled_connections() -> None:
+    for db_file in list(_POOL):
+        close_pooled_connection(db_file)
+
+atexit.register(close_all_pooled_connections)
+
 @contextmanager
-def db_session(db_file=DB_PATH):
-    connect = open_db(db_file)
+def transaction(cursor):
+    """Run the block inside BEGIN IMMEDIATE ... COMMIT, joining the caller's transaction if one is open."""
+    if cursor.connection.in_transaction:
+        yield cursor
+        return
+    cursor.execute("BEGIN IMMEDIATE;")
     try:
-        yield connect, connect.cursor()
-        connect.commit()
+        yield cursor
+        cursor.execute("COMMIT;")
     except Exception:
-        connect.rollback()
+        cursor.execute("ROLLBACK;")
         raise
-    finally:
-        connect.close()
-
-
 
+@contextmanager
+def db_session(db_file=DB_PATH):
+    connect = get_pooled_connection(db_file)
+    cursor = connect.cursor()
+    try:
+        with transaction(cursor):
+            yield connect, cursor
+    finally:
+        cursor.close()
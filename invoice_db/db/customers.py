@@ -1,24 +1,56 @@
 import sqlite3
 from .validators import normalize_name, normalize_email
-from .utils import to_cents
+from .utils import to_cents, build_update_sql
+from .connection import SUPPORTS_RETURNING
+
+_SQL_GET_CUSTOMER_BY_ID = "SELECT * FROM customers WHERE id = ?"
 
 # Create
 def create_customer(cursor, name: str, email: str) -> int:
     name = normalize_name(name)
     email = normalize_email(email)
-    assert_email_unique(cursor, email)
+    # The unique email index decides; no pre-check SELECT needed.
+    cursor.execute("""
+        INSERT INTO customers (name, email) 
+        VALUES (?, ?)
+        ON CONFLICT (lower(email)) DO NOTHING
+    """, (name, email))
+    if cursor.rowcount == 0:
+        raise ValueError(f"Email '{email}' already exists.")
+    return cursor.lastrowid
+
+def create_customers(cursor, rows: list[tuple[str, str]]) -> int:
+    """Insert many (name, email) pairs with a single executemany; returns the number inserted."""
+    normalized = [(normalize_name(name), normalize_email(email)) for name, email in rows]
+    # Savepoint so a failed batch can be undone before looking up which email conflicted.
+    cursor.execute("SAVEPOINT create_customers")
     try:
-        cursor.execute("""
-            INSERT INTO customers (name, email) 
+        cursor.executemany("""
+            INSERT INTO customers (name, email)
             VALUES (?, ?)
-        """, (name, email))
-        return cursor.lastrowid
+        """, normalized)
     except sqlite3.IntegrityError as e:
-        raise ValueError("Email already exists") from e
+        cursor.execute("ROLLBACK TO create_customers")
+        email = _first_duplicate_email(cursor, [email for _, email in normalized])
+        if email is None:
+            raise  # not an email conflict (e.g. a CHECK or NOT NULL failure)
+        raise ValueError(f"Email '{email}' already exists.") from e
+    finally:
+        cursor.execute("RELEASE create_customers")
+    return len(normalized)
+
+def _first_duplicate_email(cursor, emails: list[str]) -> str | None:
+    """Return the first email that is already stored or repeats earlier in the batch."""
+    seen = set()
+    for email in emails:
+        if email in seen or get_customer_id_by_email(cursor, email) is not None:
+            return email
+        seen.add(email)
+    return None
 
 # Read
 def get_customer_by_id(cursor, customer_id: int) -> dict:
-    cursor.execute("SELECT * FROM customers WHERE id = ?", (customer_id,))
+    cursor.execute(_SQL_GET_CUSTOMER_BY_ID, (customer_id,))
     return cursor.fetchone()
 
 def get_customer_by_email(cursor, email: str) -> dict:
@@ -26,8 +58,8 @@ def get_customer_by_email(cursor, email: str) -> dict:
     return cursor.fetchone()
 
 def get_customer_id_by_email(cursor, email: str) -> int:
-    row = get_customer_by_email(cursor, email)
-    return row['id'] if row else None
+    row = cursor.execute("SELECT id FROM customers WHERE lower(email) = lower(?)", (email,)).fetchone()
+    return row[0] if row else None
 
 def get_customers(cursor, min_total_dollars: int = 0) -> list:
     min_cents = to_cents(min_total_dollars)
@@ -46,47 +78,40 @@ def get_customers(cursor, min_total_dollars: int = 0) -> list:
     return cursor.fetchall()
 
 def get_customer_invoice_summary(cursor) -> list:
-    """Return a list of customers with their invoice counts and total from view customer_invoice_summary"""
+    """Return a list of customers with their invoice counts and totals from view customer_invoice_summary"""
     cursor.execute("SELECT * FROM customer_invoice_summary ORDER BY customer_id")
     return cursor.fetchall()
 
 
 # Update
-def update_customer(cursor, customer_id: int, name: str = None, email: str = None) -> bool:
-    updates, params = [], []
+def update_customer(cursor, customer_id: int, name: str = None, email: str = None) -> dict | None:
+    """Update name and/or email and return the updated row (None if nothing changed or not found)."""
+    columns, params = [], []
 
     if name:
-        updates.append("name = ?")
+        columns.append("name")
         params.append(normalize_name(name))
     if email:
-        assert_email_unique(cursor, email, exclude_customer_id=customer_id)
-        updates.append("email = ?")
-        params.append(normalize_email(email))
+        email = normalize_email(email)
+        columns.append("email")
+        params.append(email)
 
-    if not updates:
-        return False # nothing to update
+    if not columns:
+        return None # nothing to update
     
+    # Columns are always appended in the same order, so each combination maps to one cached SQL string.
     params.append(customer_id)
-    query = f"UPDATE customers SET {', '.join(updates)} WHERE id = ?"
-    cursor.execute(query, tuple(params))
-    return cursor.rowcount > 0
+    query = build_update_sql("customers", tuple(columns), SUPPORTS_RETURNING)
+    try:
+        cursor.execute(query, tuple(params))
+        if not SUPPORTS_RETURNING:
+            return get_customer_by_id(cursor, customer_id) if cursor.rowcount > 0 else None
+        return cursor.fetchone()
+    except sqlite3.IntegrityError as e:
+        # Only the unique email index can fail here; name/email are already validated.
+        raise ValueError(f"Email '{email}' already exists.") from e
 
 # Delete
 def delete_customer(cursor, customer_id: int) -> bool:
     cursor.execute("DELETE FROM customers WHERE id = ?", (customer_id,))
     return cursor.rowcount > 0
-
-
-# Assertions
-def assert_customer_exists(cursor, customer_id: int) -> None:
-    row = cursor.execute("SELECT 1 FROM customers WHERE id=?", (customer_id,)).fetchone()
-    if not row:
-        raise ValueError (f"Customer not found (id={customer_id})")
-    
-def assert_email_unique(cursor, email: str, exclude_customer_id: int | None = None) -> None:
-    email = email.strip().lower()
-    row = cursor.execute(
-        "SELECT id FROM customers WHERE lower(email) = lower(?)", (email,)
-    ).fetchone()
-    if row and (exclude_customer_id is None or row['id'] != exclude_customer_id):
-        raise ValueError(f"Email '{(email)}' already exists.")
\ No newline at end of file
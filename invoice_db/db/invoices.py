@@ -1,13 +1,22 @@
+import sqlite3
 from datetime import date, timedelta
 
-from .customers import assert_customer_exists, get_customer_id_by_email
+from .customers import get_customer_id_by_email
 from .validators import validate_total, validate_status, validate_sort
-from .utils import to_iso, to_cents
+from .utils import to_iso, to_cents, build_update_sql
+from .connection import SUPPORTS_RETURNING
+
+_SQL_GET_INVOICE_BY_ID = "SELECT * FROM invoices WHERE id = ?"
+
+# Helpers
+def raise_if_missing_customer(error: sqlite3.IntegrityError, customer_id: int | None) -> None:
+    """Translate a customer_id foreign key violation into the usual 'Customer not found' ValueError."""
+    if "FOREIGN KEY" in str(error):
+        raise ValueError(f"Customer not found (id={customer_id})") from error
 
 # Create
 def add_invoice_to_customer(cursor, customer_id: int, date_issued: str = None, total: int = 0, date_due: str = None, status: str = "draft") -> int:
     """Attach a new invoice to an existing customer with customer_id."""
-    assert_customer_exists(cursor, customer_id)
     validate_total(total)
     date_issued = to_iso(date_issued)
     date_due = to_iso(date_due)
@@ -20,15 +29,51 @@ def add_invoice_to_customer(cursor, customer_id: int, date_issued: str = None, t
         if (date_issued > date_due):
             raise ValueError("Due date must be later than the date issued.")
 
-    cursor.execute("""
-        INSERT INTO invoices (customer_id, date_issued, date_due, total, status)
-        VALUES (?, ?, ?, ?, ?)
-    """, (customer_id, date_issued, date_due, total, status))
+    try:
+        cursor.execute("""
+            INSERT INTO invoices (customer_id, date_issued, date_due, total, status)
+            VALUES (?, ?, ?, ?, ?)
+        """, (customer_id, date_issued, date_due, total, status))
+    except sqlite3.IntegrityError as e:
+        raise_if_missing_customer(e, customer_id)
+        raise
     return cursor.lastrowid
 
+def bulk_add_invoices(cursor, rows: list[tuple]) -> int:
+    """Insert many draft invoices with one executemany. Rows are (customer_id, date_issued, total, date_due)."""
+    normalized = []
+    for customer_id, date_issued, total, date_due in rows:
+        validate_total(total)
+        date_issued = to_iso(date_issued)
+        date_due = to_iso(date_due)
+        if date_issued is not None and date_due is not None and date_issued > date_due:
+            raise ValueError("Due date must be later than the date issued.")
+        normalized.append((customer_id, date_issued, date_due, to_cents(total)))
+
+    if not normalized:
+        return 0
+
+    customer_ids = sorted({row[0] for row in normalized})
+    found = set()
+    chunk_size = 999  # 1 param per customer id, at SQLite's 999-variable floor
+    for start in range(0, len(customer_ids), chunk_size):
+        chunk = customer_ids[start:start + chunk_size]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(f"SELECT id FROM customers WHERE id IN ({placeholders})", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    missing = set(customer_ids) - found
+    if missing:
+        raise ValueError(f"Customer not found (id={min(missing)})")
+
+    cursor.executemany("""
+        INSERT INTO invoices (customer_id, date_issued, date_due, total, status)
+        VALUES (?, ?, ?, ?, 'draft')
+    """, normalized)
+    return cursor.rowcount
+
 # READ
 def get_invoice_by_id(cursor, invoice_id: int) -> dict:
-    cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
+    cursor.execute(_SQL_GET_INVOICE_BY_ID, (invoice_id,))
     return cursor.fetchone()
 
 def get_invoices_by_email(cursor, email: str) -> dict:
@@ -65,7 +110,7 @@ def count_invoices(
     min_total: int | None = None,
     max_total: int | None = None,
 ) -> int:
-    query = ("SELECT COUNT(*) AS invoice_count FROM invoices")
+    query = "SELECT COUNT(*) FROM invoices"
     clauses = []
     params = []
 
@@ -86,9 +131,8 @@ def count_invoices(
     if clauses:
         query += " WHERE " + " AND ".join(clauses)
 
-    cursor.execute(query, params)
-    row = cursor.fetchone()
-    return row["invoice_count"] if row else 0
+    # Aggregates always return exactly one row; read the scalar positionally.
+    return cursor.execute(query, params).fetchone()[0]
 
 def list_invoices(
     cursor, 
@@ -106,7 +150,7 @@ def list_invoices(
         "date_due": "i.date_due",
         "total": "i.total", 
         "status": "i.status",
-        "created_at" : "i.created",
+        "created_at" : "i.created_at",
     }
     validate_sort(sort_by, sort_columns)
     validate_status(status)
@@ -121,8 +165,10 @@ def list_invoices(
         i.total, 
         i.created_at, 
         i.updated_at, 
-        i.status
+        i.status,
+        c.name AS customer_name
     FROM invoices i
+    JOIN customers c ON c.id = i.customer_id
     """
 
     clauses, params = [], []
@@ -145,7 +191,7 @@ def list_invoices(
         sql += "WHERE " + " AND ".join(clauses)
 
     sql += f"""
-    ORDER BY {sort_by} {direction}, id DESC
+    ORDER BY {sort_columns[sort_by]} {direction}, i.id DESC
     LIMIT ? 
     OFFSET ?
     """
@@ -222,31 +268,23 @@ def list_overdue_invoices(
 
 
 def sum_invoices_by_customer(cursor, customer_id: int) -> int:
-    cursor.execute("""
-        SELECT COALESCE(SUM(total), 0) AS total_sum
+    return cursor.execute("""
+        SELECT COALESCE(SUM(total), 0)
         FROM invoices
         WHERE customer_id = ?
-    """, (customer_id,))
-    return cursor.fetchone()['total_sum']
+    """, (customer_id,)).fetchone()[0]
 
 
 # UPDATE
-def update_invoice(
-        cursor,
-        invoice_id: int, 
-        *, 
-        date_issued: int = None, 
-        date_due: int = None, 
-        total: int = None, 
+def get_invoice_changes(
+        invoice: dict,
+        *,
+        date_issued: str = None,
+        date_due: str = None,
+        total: float = None,
         customer_id: int = None
-) -> bool:
-    
-    invoice = get_invoice_by_id(cursor, invoice_id)
-    if not invoice:
-        return False
-
-    updates, params = [], []
-    
+) -> dict:
+    """Validate the requested values against the stored invoice; returns {column: value} for those that differ."""
     new_date_issued = to_iso(date_issued) if date_issued is not None else invoice["date_issued"]
     new_date_due = to_iso(date_due) if date_due is not None else invoice["date_due"]
 
@@ -254,28 +292,76 @@ def update_invoice(
         if new_date_due < new_date_issued:
             raise ValueError("Due date must be later than or equal to date issued.")
 
-    if date_issued:
-        updates.append("date_issued = ?")
-        params.append(new_date_issued)
-    if date_due:
-        updates.append("date_due = ?")
-        params.append(new_date_due)
-    if total:
+    changes = {}
+    if date_issued is not None and new_date_issued != invoice["date_issued"]:
+        changes["date_issued"] = new_date_issued
+    if date_due is not None and new_date_due != invoice["date_due"]:
+        changes["date_due"] = new_date_due
+    if total is not None:
         validate_total(total)
-        updates.append("total = ?")
-        params.append(to_cents(total))
-    if  customer_id:
-        assert_customer_exists(cursor, customer_id)
-        updates.append("customer_id = ?")
-        params.append(customer_id)
+        new_total = to_cents(total)
+        if new_total != invoice["total"]:
+            changes["total"] = new_total
+    if customer_id is not None and customer_id != invoice["customer_id"]:
+        changes["customer_id"] = customer_id
+    return changes
+
+def apply_invoice_changes(cursor, invoice_id: int, changes: dict) -> dict | None:
+    """Write {column: value} changes (from get_invoice_changes) and return the updated row (None if empty or not found)."""
+    if not changes:
+        return None
+
+    query = build_update_sql("invoices", tuple(changes), SUPPORTS_RETURNING)
+    try:
+        cursor.execute(query, (*changes.values(), invoice_id))
+    except sqlite3.IntegrityError as e:
+        raise_if_missing_customer(e, changes.get("customer_id"))
+        raise
+    if not SUPPORTS_RETURNING:
+        return get_invoice_by_id(cursor, invoice_id) if cursor.rowcount > 0 else None
+    return cursor.fetchone()
 
-    if not updates:
-        return False
-    
-    params.append(invoice_id)
-    query = f"UPDATE invoices SET {', '.join(updates)} WHERE id = ?"
-    cursor.execute(query, tuple(params))
-    return cursor.rowcount > 0
+def update_invoice(
+        cursor,
+        invoice_id: int, 
+        *, 
+        date_issued: str = None, 
+        date_due: str = None, 
+        total: float = None, 
+        customer_id: int = None
+) -> dict | None:
+    """Update the given invoice fields and return the updated row (None if nothing changed or not found)."""
+    invoice = get_invoice_by_id(cursor, invoice_id)
+    if not invoice:
+        return None
+
+    changes = get_invoice_changes(
+        invoice, date_issued=date_issued, date_due=date_due, total=total, customer_id=customer_id
+    )
+    return apply_invoice_changes(cursor, invoice_id, changes)
+
+def bulk_update_invoice_totals(cursor, totals: dict[int, float]) -> int:
+    """Set many invoice totals (invoice_id -> dollars) with one CASE UPDATE per chunk; returns rows updated."""
+    for total in totals.values():
+        validate_total(total)
+    items = [(invoice_id, to_cents(total)) for invoice_id, total in totals.items()]
+
+    updated = 0
+    chunk_size = 300  # 3 params per invoice keeps each statement under SQLite's 999-variable floor
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        cases = " ".join("WHEN ? THEN ?" for _ in chunk)
+        placeholders = ", ".join("?" * len(chunk))
+        params = [value for pair in chunk for value in pair]
+        params.extend(invoice_id for invoice_id, _ in chunk)
+        cursor.execute(f"""
+            UPDATE invoices
+            SET total = CASE id {cases} END,
+                updated_at = datetime('now', 'localtime')
+            WHERE id IN ({placeholders})
+        """, params)
+        updated += cursor.rowcount
+    return updated
 
 def set_invoice_status(cursor, invoice_id: int, status: str) -> bool:
     cursor.execute(
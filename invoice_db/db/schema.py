@@ -1,57 +1,67 @@
-# TRIGGER
-def create_triggers(cursor):
-    cursor.executescript("""
+from .connection import transaction
+
+# DDL is kept as individual statements so each create_* helper can run them
+# with cursor.execute inside one transaction instead of re-parsing a script
+# through executescript (which commits after every statement).
+
+TRIGGERS = (
+    """
     CREATE TRIGGER IF NOT EXISTS trigger_customers_updated
-    AFTER UPDATE ON 
+    AFTER UPDATE ON
         customers
-    WHEN 
+    WHEN
         NEW.updated_at = OLD.updated_at
     BEGIN
         UPDATE customers
         SET updated_at = datetime('now', 'localtime')
         WHERE id = NEW.id;
-    END;
-                         
+    END
+    """,
+    """
     CREATE TRIGGER IF NOT EXISTS trigger_invoices_updated
     AFTER UPDATE ON
         invoices
-    WHEN 
+    WHEN
         NEW.updated_at = OLD.updated_at
     BEGIN
         UPDATE invoices
         SET updated_at = datetime('now', 'localtime')
         WHERE id = NEW.id;
-    END;
-    """)
+    END
+    """,
+)
 
-# TABLE CREATION
-def create_customer_schema(cursor):
-    cursor.executescript("""
-    -- Customers table: stores basic account information.                       
+CUSTOMER_SCHEMA = (
+    # Customers table: stores basic account information.
+    """
     CREATE TABLE IF NOT EXISTS customers (
         id          INTEGER PRIMARY KEY,
         name        TEXT    NOT NULL CHECK (length(trim(name)) > 0),
         email       TEXT    NOT NULL CHECK (length(trim(email)) > 0 ),
         created_at  TEXT    NOT NULL DEFAULT (datetime('now', 'localtime')),
         updated_at  TEXT    NOT NULL DEFAULT (datetime('now', 'localtime'))
-    );
-    
-    -- Enforce case-insensitive unique emails & index customer names.
-    CREATE UNIQUE INDEX IF NOT EXISTS 
-        idx_customers_email_nocase ON customers(lower(email));
+    )
+    """,
+    # Enforce case-insensitive unique emails & index customer names.
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS
+        idx_customers_email_nocase ON customers(lower(email))
+    """,
+    """
     CREATE INDEX IF NOT EXISTS
-        idx_customers_name ON customers(name);
-    """)
+        idx_customers_name ON customers(name)
+    """,
+)
 
-def create_invoice_schema(cursor):
-    cursor.executescript("""
-    -- Invoices table: records all invoices linked to a customer.
+INVOICE_SCHEMA = (
+    # Invoices table: records all invoices linked to a customer.
+    """
     CREATE TABLE IF NOT EXISTS invoices (
         id              INTEGER PRIMARY KEY,
         customer_id     INTEGER NOT NULL,
         date_issued     TEXT,
         date_due        TEXT,
-        total           INTEGER NOT NULL DEFAULT 0 
+        total           INTEGER NOT NULL DEFAULT 0
                         CHECK (total >= 0 AND total = CAST(total AS INTEGER)),
         status          TEXT    NOT NULL DEFAULT 'draft'
                         CHECK (status IN ('draft','sent','paid','void')),
@@ -60,39 +70,77 @@ def create_invoice_schema(cursor):
     CHECK (
         status = 'draft'
         OR (date_issued IS NOT NULL AND date_due IS NOT NULL)
-    )    
+    )
     CHECK (
         date_issued IS NULL
         OR date_due IS NULL
-        OR date_issued <= date_due                     
+        OR date_issued <= date_due
     )
     FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE -- deletes invoices when customer removed
-    );
-                         
-    -- Index frequent queries and filtering patterns.
-    CREATE INDEX IF NOT EXISTS 
-        idx_invoices_customer_id ON invoices(customer_id);                         
-    CREATE INDEX IF NOT EXISTS 
-        idx_invoices_date_issued ON invoices(date_issued);
-    CREATE INDEX IF NOT EXISTS 
-        idx_invoices_date_due ON invoices(date_due);
-    CREATE INDEX IF NOT EXISTS 
-        idx_invoices_customer_date ON invoices(customer_id, date_issued);
-    """)
+    )
+    """,
+    # Index frequent queries and filtering patterns.
+    # customer_id lookups are served by idx_invoices_customer_date's leading column.
+    "DROP INDEX IF EXISTS idx_invoices_customer_id",
+    """
+    CREATE INDEX IF NOT EXISTS
+        idx_invoices_date_issued ON invoices(date_issued)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS
+        idx_invoices_date_due ON invoices(date_due)
+    """,
+    # Per-customer listings filter on customer_id and sort by date_issued. Not a covering
+    # index: copying most of the row would add another wide b-tree write to every insert/update.
+    """
+    CREATE INDEX IF NOT EXISTS
+        idx_invoices_customer_date ON invoices(customer_id, date_issued)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS
+        idx_invoices_status_due ON invoices(status, date_due)
+    """,
+)
 
-def create_customer_summary_view(cursor):
-    cursor.executescript("""
+CUSTOMER_SUMMARY_VIEW = (
+    """
     CREATE VIEW IF NOT EXISTS customer_invoice_summary AS
     SELECT
         c.id AS customer_id,
-        c.name, 
+        c.name,
         c.email,
         COUNT(i.id) AS invoice_count,
         COALESCE(SUM(i.total), 0) AS total_cents
-    FROM 
+    FROM
         customers c
-    LEFT JOIN 
+    LEFT JOIN
         invoices i ON i.customer_id = c.id
-    GROUP BY 
-        c.id, c.name, c.email;
-    """)
\ No newline at end of file
+    GROUP BY
+        c.id, c.name, c.email
+    """,
+)
+
+# HELPERS
+def run_ddl(cursor, statements) -> None:
+    """Execute DDL statements in one transaction, joining the caller's if one is open."""
+    with transaction(cursor):
+        for statement in statements:
+            cursor.execute(statement)
+
+# TRIGGER
+def create_triggers(cursor):
+    run_ddl(cursor, TRIGGERS)
+
+# TABLE CREATION
+def create_customer_schema(cursor):
+    run_ddl(cursor, CUSTOMER_SCHEMA)
+
+def create_invoice_schema(cursor):
+    run_ddl(cursor, INVOICE_SCHEMA)
+
+def create_customer_summary_view(cursor):
+    run_ddl(cursor, CUSTOMER_SUMMARY_VIEW)
+
+def create_schema(cursor):
+    """Create all tables, indexes and views in a single transaction."""
+    run_ddl(cursor, CUSTOMER_SCHEMA + INVOICE_SCHEMA + CUSTOMER_SUMMARY_VIEW)
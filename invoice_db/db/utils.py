@@ -1,29 +1,64 @@
+import re
 from decimal import Decimal, ROUND_HALF_UP
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 
+DECIMAL_RE = re.compile(r"^([+-]?)(\d*)(?:\.(\d*))?$")
+ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+US_DATE_RE = re.compile(r"^(\d{1,2})([-/])(\d{1,2})\2(\d{4})$")
+
+@lru_cache(maxsize=1024)
 def to_cents(amount: int) -> int:
-    """Coerce 12.34 / '12.34' -> 1234 (int cents)."""
-    return int((Decimal(str(amount)) * Decimal("100")).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    """Coerce 12.34 / '12.34' -> 1234 (int cents), rounding half up."""
+    if isinstance(amount, int):
+        return amount * 100
+
+    text = str(amount).strip()
+    match = DECIMAL_RE.match(text)
+    if not match or not (match[2] or match[3]):
+        # Exponent notation and anything unusual keep the exact Decimal path.
+        return int((Decimal(text) * Decimal("100")).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+    sign, whole, frac = match[1], match[2] or "0", (match[3] or "").ljust(3, "0")
+    cents = int(whole) * 100 + int(frac[:2]) + (frac[2] >= "5")
+    return -cents if sign == "-" else cents
 
 def fmt_dollars(cents: int) -> str:
     """Convert integer cents (e.g. 35025) → formatted string '$350.25'."""
-    return f"${(Decimal(cents) / Decimal(100)).quantize(Decimal('0.01'))}"
+    cents = int(cents)
+    dollars, rem = divmod(abs(cents), 100)
+    sign = "-" if cents < 0 else ""
+    return f"${sign}{dollars}.{rem:02d}"
 
 def fmt_optional(value: str | None, empty: str = "-") -> str:
-    return "-" if value is None else str(value)
+    return empty if value is None else str(value)
 
+@lru_cache(maxsize=1024)
 def to_iso(date_str: str) -> str:
     """Coerce 'MM-DD-YYYY' / 'MM/DD/YYYY' / 'YYYY-MM-DD' → 'YYYY-MM-DD'."""
     if not date_str:
         return None
     
-    formats = ("%m-%d-%Y", "%m/%d/%Y", "%Y-%m-%d")
+    text = date_str.strip()
+    if match := ISO_DATE_RE.match(text):
+        year, month, day = match[1], match[2], match[3]
+    elif match := US_DATE_RE.match(text):
+        month, day, year = match[1], match[3], match[4]
+    else:
+        match = None
 
-    for fmt in formats:
+    if match:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
-            return dt.strftime("%Y-%m-%d")
+            return date(int(year), int(month), int(day)).isoformat()
         except ValueError:
-            continue
+            pass
     
-    raise ValueError(f"Invalid date format: {date_str} (expected MM-DD-YYYY or MM/DD/YYYY, or YYYY-MM-DD)")
\ No newline at end of file
+    raise ValueError(f"Invalid date format: {date_str} (expected MM-DD-YYYY or MM/DD/YYYY, or YYYY-MM-DD)")
+
+@lru_cache(maxsize=64)
+def build_update_sql(table: str, columns: tuple[str, ...], returning: bool = False) -> str:
+    """Build 'UPDATE table SET col = ?, ... WHERE id = ?' (stamping updated_at) once per column set."""
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    # updated_at is set here rather than by trigger so RETURNING reflects it.
+    sql = f"UPDATE {table} SET {assignments}, updated_at = datetime('now', 'localtime') WHERE id = ?"
+    return sql + " RETURNING *" if returning else sql
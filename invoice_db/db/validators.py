@@ -1,13 +1,15 @@
+import math
 import re
 
-EMAIL_RE = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$")
-NAME_RE = re.compile(r"^[A-Za-z][A-Z-a-z' -]*[A-Za-z]$")
+EMAIL_RE = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$", re.ASCII)
+NAME_RE = re.compile(r"^[A-Za-z][A-Za-z' -]*[A-Za-z]$", re.ASCII)
 
 # Customer
 def normalize_name(name: str) -> str:
     if not name or not isinstance(name, str):
         raise ValueError("Name cannot be empty.")
-    name = " ".join(name.strip().split()).title()
+    # split() already drops leading/trailing whitespace, so no separate strip() pass.
+    name = " ".join(name.split()).title()
     if not NAME_RE.match(name):
         raise ValueError("Invalid name format: only letters, spaces, apostrophes, and hyphens are allowed.")
     return name
@@ -28,6 +30,8 @@ def validate_total(amount: int | float) -> int:
         amount = float(amount)
     except (TypeError, ValueError):
         raise ValueError("Invoice total must be a valid number.")
+    if not math.isfinite(amount):
+        raise ValueError("Invoice total must be a finite number.")
     if amount < 0:
         raise ValueError("Invoice total cannot be negative.")
     return amount
@@ -3,7 +3,7 @@ import sqlite3
 from datetime import date, timedelta
 from pathlib import Path
 
-from invoice_db.db import schema, customers, invoices, utils
+from invoice_db.db import connection, schema, customers, invoices, utils
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Seed invoicedb with sample data.")
@@ -20,14 +20,11 @@ def parse_args():
     return parser.parse_args()
 
 def get_connection(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    # Autocommit connection; main() owns the single explicit transaction.
+    return connection.open_db(db_path, isolation_level=None)
 
 def init_db(cursor) -> None:
-    schema.create_customer_schema(cursor)
-    schema.create_invoice_schema(cursor)
+    schema.create_schema(cursor)
 
 def seed_customers(cursor) -> dict[str, int]:
     john_id = customers.create_customer(
@@ -53,39 +50,15 @@ def seed_invoices(cursor, customer_ids: dict[str, int]) -> dict[str, int]:
     john_id = customer_ids["john"]
     alice_id = customer_ids["alice"]
 
-    john_draft = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=john_id,
-        total=250,
-        status="draft",
-    )
-
-    john_sent_overdue = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=john_id,
-        total=1000,
-        date_issued=issued_date,
-        date_due=past_due,
-        status="draft",
-    )
-
-    alice_paid = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=alice_id,
-        total=400.25,
-        date_issued=issued_date,
-        date_due=past_due,
-        status="draft",
-    )
-
-    alice_void = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=alice_id,
-        total=750,
-        date_issued=issued_date,
-        date_due=future_due,
-        status="draft",
-    )
+    invoices.bulk_add_invoices(cursor, [
+        (john_id, None, 250, None),
+        (john_id, issued_date, 1000, past_due),
+        (alice_id, issued_date, 400.25, past_due),
+        (alice_id, issued_date, 750, future_due),
+    ])
+    # Seeding always starts from an empty database, so ids follow insertion order.
+    cursor.execute("SELECT id FROM invoices ORDER BY id")
+    john_draft, john_sent_overdue, alice_paid, alice_void = (row["id"] for row in cursor.fetchall())
 
     status_updates = [
         (john_sent_overdue, "sent"),
@@ -121,12 +94,10 @@ def main():
     conn = get_connection(str(db_path))
     try:
         cursor = conn.cursor()
-        init_db(cursor)
-
-        customer_ids = seed_customers(cursor)
-        invoice_ids = seed_invoices(cursor, customer_ids)
-
-        conn.commit()
+        with connection.transaction(cursor):
+            init_db(cursor)
+            customer_ids = seed_customers(cursor)
+            invoice_ids = seed_invoices(cursor, customer_ids)
 
         print(f"Seeded database: {db_path}")
         print("Customers:")
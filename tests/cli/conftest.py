@@ -1,23 +1,44 @@
-import re
 import pytest
 from invoice_db.cli.app import app
+from invoice_db.cli import common
+from invoice_db.db import schema
 from typer.testing import CliRunner
 
 
-CUSTOMER_ID_REGEX = re.compile(r"id=(\d+)")
-INVOICE_ID_REGEX = re.compile(r"Created invoice \(id=(\d+)\)")
+def parse_created_id(stdout: str) -> int:
+    """Return N from the '(id=N)' token printed by the create commands."""
+    _, found, rest = stdout.partition("(id=")
+    assert found, f"Could not parse id from output: {stdout}"
+    return int(rest.partition(")")[0])
 
 #CLI fixtures
-@pytest.fixture
+@pytest.fixture(scope="module", autouse=True)
+def fast_db():
+    # CLI test databases are throwaway and single-process.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("INVOICEDB_FAST", "1")
+        yield
+
+@pytest.fixture(scope="session")
 def runner():
     return CliRunner()
 
-@pytest.fixture
-def temp_db(runner, tmp_path):
-    db_path = tmp_path / "test.db"
-    result = runner.invoke(app, ["db", "init", "--db", str(db_path)])
+@pytest.fixture(scope="module")
+def module_db(fast_db, runner, tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("cli") / "test.db")
+    result = runner.invoke(app, ["db", "init", "--db", db_path])
     assert result.exit_code == 0, result.stdout
-    return str(db_path)
+    yield db_path
+    common.close_connection(db_path)
+
+@pytest.fixture
+def temp_db(module_db):
+    # Reuse the module's database; recreate the schema in case a test dropped or deleted it.
+    with common.get_connection(module_db) as (connect, cursor):
+        schema.create_schema(cursor)
+        cursor.execute("DELETE FROM invoices;")
+        cursor.execute("DELETE FROM customers;")
+    return module_db
 
 @pytest.fixture
 def customer_john(runner, temp_db):
@@ -28,9 +49,7 @@ def customer_john(runner, temp_db):
         "--db", temp_db
     ])
     assert result.exit_code == 0, result.stdout
-    match = CUSTOMER_ID_REGEX.search(result.stdout)
-    assert match, f"Could not parse customer id from output: {result.stdout}"
-    return int(match.group(1))
+    return parse_created_id(result.stdout)
 
 @pytest.fixture
 def customer_alice(runner, temp_db):
@@ -41,9 +60,7 @@ def customer_alice(runner, temp_db):
         "--db", temp_db
     ])
     assert result.exit_code == 0, result.stdout
-    match = CUSTOMER_ID_REGEX.search(result.stdout)
-    assert match, f"Could not parse customer id from output: {result.stdout}"
-    return int(match.group(1))
+    return parse_created_id(result.stdout)
 
 @pytest.fixture
 def invoice_john(runner, temp_db, customer_john):
@@ -54,9 +71,7 @@ def invoice_john(runner, temp_db, customer_john):
         "--db", temp_db
     ])
     assert result.exit_code == 0, result.stdout
-    match = INVOICE_ID_REGEX.search(result.stdout)
-    assert match, f"Could not parse invoice id from output: {result.stdout}"
-    return int(match.group(1))
+    return parse_created_id(result.stdout)
 
 @pytest.fixture
 def invoice_alice(runner, temp_db, customer_alice):
@@ -67,6 +82,4 @@ def invoice_alice(runner, temp_db, customer_alice):
         "--db", temp_db
     ])
     assert result.exit_code == 0, result.stdout
-    match = INVOICE_ID_REGEX.search(result.stdout)
-    assert match, f"Could not parse invoice id from output: {result.stdout}"
-    return int(match.group(1))
+    return parse_created_id(result.stdout)
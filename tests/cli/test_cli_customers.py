@@ -1,4 +1,6 @@
 from invoice_db.cli.app import app
+from invoice_db.cli import common
+from invoice_db.db import schema
 
 CUSTOMER_JOHN_EMAIL = "john@test.com"
 
@@ -6,7 +8,7 @@ CUSTOMER_JOHN_EMAIL = "john@test.com"
 def test_customers_help_commands(runner):
     result = runner.invoke(app, ["customers", "--help"])
     assert result.exit_code == 0
-    expected_commands = ["create", "delete", "get", "list", "update"]
+    expected_commands = ["create", "bulk-create", "delete", "get", "list", "update"]
     for cmd in expected_commands:
         assert cmd in result.stdout
 
@@ -31,12 +33,36 @@ def test_customer_list(customer_john, customer_alice, runner, temp_db):
     assert "John" in result.stdout
     assert "Alice" in result.stdout
 
+def test_customer_list_without_summary_view(runner, tmp_path):
+    # Databases initialized before the summary view existed only have the two tables.
+    db_path = str(tmp_path / "legacy.db")
+    try:
+        with common.get_connection(db_path) as (connect, cursor):
+            schema.create_customer_schema(cursor)
+            schema.create_invoice_schema(cursor)
+        runner.invoke(app, ["customers", "create", "--name", "John", "--email", CUSTOMER_JOHN_EMAIL, "--db", db_path])
+        result = runner.invoke(app, ["customers", "list", "--db", db_path])
+    finally:
+        common.close_connection(db_path)
+    assert result.exit_code == 0, result.stdout
+    assert "John" in result.stdout
+
 def test_customer_delete(customer_john, runner, temp_db):
     result = runner.invoke(app, ["customers", "delete", "--id", str(customer_john), "--db", temp_db])
     assert result.exit_code == 0, result.stdout
     result = runner.invoke(app, ["customers", "get", "--email", CUSTOMER_JOHN_EMAIL, "--db", temp_db])
     assert "Customer not found" in result.stdout
 
+def test_customer_bulk_create(runner, temp_db, tmp_path):
+    csv_path = tmp_path / "customers.csv"
+    csv_path.write_text("name,email\nTom,tom@test.com\nAnn,ann@test.com\n")
+    result = runner.invoke(app, ["customers", "bulk-create", "--from-csv", str(csv_path), "--db", temp_db])
+    assert result.exit_code == 0, result.stdout
+    assert "Created 2 customers" in result.stdout
+    result = runner.invoke(app, ["customers", "list", "--db", temp_db])
+    assert "Tom" in result.stdout
+    assert "Ann" in result.stdout
+
 
 # Negative Tests
 def test_create_customer_duplicate_email_fails(customer_john, runner, temp_db):
@@ -62,6 +88,16 @@ def test_customer_update_invalid_id_fails(customer_john, runner, temp_db):
 def test_customer_delete_invalid_id_fails(customer_john, runner, temp_db):
     result = runner.invoke(app, ["customers", "delete", "--id", "-9999", "--db", temp_db])
     assert result.exit_code == 1, result.stdout
-    assert "Customer not found" in result.stdout
+    assert "Customer not found (id=-9999)" in result.stdout
 
-# Invoice
+def test_create_customer_invalid_email_fails_before_opening_db(runner, tmp_path):
+    db_path = tmp_path / "untouched.db"
+    result = runner.invoke(app, ["customers", "create", "--name", "Tom", "--email", "not-an-email", "--db", str(db_path)])
+    assert result.exit_code == 1, result.stdout
+    assert "Invalid email format" in result.stdout
+    assert not db_path.exists()
+
+def test_customer_get_zero_id_and_email_fails(customer_john, runner, temp_db):
+    result = runner.invoke(app, ["customers", "get", "--id", "0", "--email", CUSTOMER_JOHN_EMAIL, "--db", temp_db])
+    assert result.exit_code == 1, result.stdout
+    assert "only one of --id or --email" in result.stdout
@@ -1,4 +1,9 @@
+import os
+import subprocess
+import sys
 from invoice_db.cli.app import app
+from invoice_db.cli import common
+from invoice_db.db import connection
 
 def test_cli_help_commands(runner):
     result = runner.invoke(app, ["--help"])
@@ -7,9 +12,86 @@ def test_cli_help_commands(runner):
     for cmd in expected_commands:
         assert cmd in result.stdout
 
+def test_version_does_not_load_db_query_modules():
+    # Fresh interpreter (this process already imported the db layer); decimal is only pulled in by db.utils.
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from invoice_db.cli.app import app\n"
+        "assert CliRunner().invoke(app, ['--version']).exit_code == 0\n"
+        "print('decimal' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
 def test_db_help_commands(runner):
     result = runner.invoke(app, ["db", "--help"])
     assert result.exit_code == 0
     expected_commands = ["init", "drop", "delete"]
     for cmd in expected_commands:
-        assert cmd in result.stdout
\ No newline at end of file
+        assert cmd in result.stdout
+
+def test_get_connection_reuses_connection_and_cursor_per_db_path(temp_db):
+    with common.get_connection(temp_db) as first:
+        pass
+    with common.get_connection(temp_db) as second:
+        pass
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+
+def test_get_connection_after_pool_closed_uses_fresh_cursor(runner, temp_db):
+    with common.get_connection(temp_db) as (connect, cursor):
+        pass
+    connection.close_all_pooled_connections()
+    result = runner.invoke(app, ["customers", "list", "--db", temp_db])
+    assert result.exit_code == 0, result.stdout
+    assert "Database error" not in result.stdout
+    with common.get_connection(temp_db) as (new_connect, new_cursor):
+        assert new_cursor.connection is new_connect
+    assert new_cursor is not cursor
+
+def test_get_connection_enables_wal(tmp_path, monkeypatch):
+    monkeypatch.delenv("INVOICEDB_FAST")
+    db_path = str(tmp_path / "wal.db")
+    try:
+        with common.get_connection(db_path) as (connect, cursor):
+            journal_mode = cursor.execute("PRAGMA journal_mode;").fetchone()[0]
+            foreign_keys = cursor.execute("PRAGMA foreign_keys;").fetchone()[0]
+    finally:
+        common.close_connection(db_path)
+    assert journal_mode == "wal"
+    assert foreign_keys == 1
+
+def test_get_connection_fast_mode_skips_wal(temp_db):
+    with common.get_connection(temp_db) as (connect, cursor):
+        journal_mode = cursor.execute("PRAGMA journal_mode;").fetchone()[0]
+        locking_mode = cursor.execute("PRAGMA locking_mode;").fetchone()[0]
+    assert journal_mode == "memory"
+    assert locking_mode == "exclusive"
+
+def test_transaction_rolls_back_on_error(temp_db):
+    with common.get_connection(temp_db) as (connect, cursor):
+        try:
+            with connection.transaction(cursor):
+                cursor.execute("INSERT INTO customers (name, email) VALUES ('Tom', 'tom@test.com')")
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        count = cursor.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+    assert count == 0
+
+def test_db_delete_removes_file_and_wal_sidecars(runner, tmp_path, monkeypatch):
+    monkeypatch.delenv("INVOICEDB_FAST")
+    db_path = str(tmp_path / "wal.db")
+    runner.invoke(app, ["db", "init", "--db", db_path])
+    assert os.path.exists(db_path + "-wal")
+    result = runner.invoke(app, ["db", "delete", "--db", db_path], input="y\n")
+    assert result.exit_code == 0, result.stdout
+    assert not os.path.exists(db_path)
+    assert not os.path.exists(db_path + "-wal")
+    assert not os.path.exists(db_path + "-shm")
+
+def test_db_delete_missing_file_fails(runner, tmp_path):
+    result = runner.invoke(app, ["db", "delete", "--db", str(tmp_path / "missing.db")], input="y\n")
+    assert result.exit_code == 1, result.stdout
+    assert "No database found" in result.stdout
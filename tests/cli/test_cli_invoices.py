@@ -1,10 +1,11 @@
+import pytest
 from invoice_db.cli.app import app
 
 # CRUD
 def test_invoices_help_commands(runner):
     result = runner.invoke(app, ["invoices", "--help"])
     assert result.exit_code == 0
-    expected_commands = ["create", "list", "get", "count", "update", "delete"]
+    expected_commands = ["create", "bulk-create", "list", "get", "count", "update", "delete"]
     for cmd in expected_commands:
         assert cmd in result.stdout
 
@@ -25,6 +26,8 @@ def test_invoice_list_all(customer_john, invoice_john, customer_alice, invoice_a
     assert result.exit_code == 0, result.stdout
     assert "1234" in result.stdout
     assert "9999" in result.stdout
+    assert "John" in result.stdout
+    assert "Alice" in result.stdout
 
 def test_invoice_list_one_customer(customer_john, invoice_john, runner, temp_db):
     result = runner.invoke(app, ["invoices", "create", "--customer-id", str(customer_john), "--total", "777", "--db", temp_db])
@@ -66,11 +69,52 @@ def test_update_invoice_no_fields_fails(customer_john, invoice_john, runner, tem
     assert result.exit_code == 1, result.stdout
     assert "Please enter one" in result.stdout
 
+def test_update_invoice_reports_only_changed_fields(customer_john, invoice_john, runner, temp_db):
+    result = runner.invoke(app, ["invoices", "update", "--id", str(invoice_john), "--customer", str(customer_john), "--total", "0", "--db", temp_db])
+    assert result.exit_code == 0, result.stdout
+    assert "fields: total)" in result.stdout
+    assert "$0.00" in result.stdout
+
+def test_update_invoice_same_values_fails(customer_john, invoice_john, runner, temp_db):
+    result = runner.invoke(app, ["invoices", "update", "--id", str(invoice_john), "--total", "1234", "--db", temp_db])
+    assert result.exit_code == 1, result.stdout
+    assert "No changes were applied" in result.stdout
+
 def test_update_invalid_invoice_id_fails(customer_john, invoice_john, runner, temp_db):
     result = runner.invoke(app, ["invoices", "update", "--id", "-9999", "--total", "1234", "--db", temp_db])
     assert result.exit_code == 1, result.stdout
     assert "Invoice not found" in result.stdout
 
+def test_invoice_bulk_create(customer_john, runner, temp_db, tmp_path):
+    csv_path = tmp_path / "invoices.csv"
+    csv_path.write_text(f"customer_id,total,date_issued,date_due\n{customer_john},100,2025-01-20,\n{customer_john},250.50,,\n")
+    result = runner.invoke(app, ["invoices", "bulk-create", "--from-csv", str(csv_path), "--db", temp_db])
+    assert result.exit_code == 0, result.stdout
+    assert "Created 2 invoices" in result.stdout
+    result = runner.invoke(app, ["invoices", "count", "--db", temp_db])
+    assert "Total invoices: 2" in result.stdout
+
+def test_invoice_bulk_create_invalid_customer_fails(customer_john, runner, temp_db, tmp_path):
+    csv_path = tmp_path / "invoices.csv"
+    csv_path.write_text(f"customer_id,total\n{customer_john},100\n-9999,50\n")
+    result = runner.invoke(app, ["invoices", "bulk-create", "--from-csv", str(csv_path), "--db", temp_db])
+    assert result.exit_code == 1, result.stdout
+    assert "Customer not found" in result.stdout
+    result = runner.invoke(app, ["invoices", "count", "--db", temp_db])
+    assert "Total invoices: 0" in result.stdout
+
+@pytest.mark.parametrize("csv_text, message", [
+    ("total,customer_id\n5\n", "integer customer_id"),
+    ("customer_id,total\n{customer_id},inf\n", "finite number"),
+    ("customer_id,total\n{customer_id},nan\n", "finite number"),
+], ids=["short_row", "inf_total", "nan_total"])
+def test_invoice_bulk_create_bad_rows_fail(customer_john, runner, temp_db, tmp_path, csv_text, message):
+    csv_path = tmp_path / "invoices.csv"
+    csv_path.write_text(csv_text.format(customer_id=customer_john))
+    result = runner.invoke(app, ["invoices", "bulk-create", "--from-csv", str(csv_path), "--db", temp_db])
+    assert result.exit_code == 1, result.stdout
+    assert message in result.stdout
+
 def test_delete_invoice_invalid_fails(customer_john, invoice_john, runner, temp_db):
     result = runner.invoke(app, ["invoices", "delete", "--id", "-9999", "--db", temp_db])
     assert result.exit_code == 1, result.stdout
@@ -1,28 +1,76 @@
-import sqlite3
 import pytest
-from invoice_db.db import schema, customers, invoices
+from invoice_db.db import connection, schema, customers, invoices
 from datetime import date, timedelta
 
 # DB fixtures
-@pytest.fixture
-def db():
-    connect = sqlite3.connect(":memory:")
-    connect.row_factory = sqlite3.Row
-    cursor = connect.cursor()
-    cursor.execute("PRAGMA foreign_keys = ON;")
-
-    schema.create_customer_schema(cursor)
-    schema.create_invoice_schema(cursor)
-    connect.commit()
+@pytest.fixture(scope="session")
+def shared_db():
+    # One in-memory database with the schema built once; tests are isolated by savepoints.
+    # open_db applies foreign_keys, temp_store and cache_size; fast mode adds
+    # synchronous=OFF, journal_mode=MEMORY and locking_mode=EXCLUSIVE.
+    connect = connection.open_db(":memory:", fast=True, isolation_level=None)
+    schema.create_schema(connect.cursor())
 
     yield connect
 
     connect.close()
 
+@pytest.fixture
+def db(shared_db):
+    shared_db.execute("SAVEPOINT test;")
+
+    yield shared_db
+
+    shared_db.execute("ROLLBACK TO test;")
+    shared_db.execute("RELEASE test;")
+
 @pytest.fixture
 def cursor(db):
     return db.cursor()
 
+@pytest.fixture
+def tuple_cursor(db):
+    """Cursor returning plain tuples, for verification queries read positionally."""
+    tuple_cursor = db.cursor()
+    tuple_cursor.row_factory = None
+    return tuple_cursor
+
+@pytest.fixture
+def add_invoices(cursor):
+    """Insert (customer_id, date_issued, total, date_due) draft invoices in one batch; returns their ids in order."""
+    def _add_invoices(rows: list[tuple]) -> list[int]:
+        count = invoices.bulk_add_invoices(cursor, rows)
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - count + 1, last_id + 1))
+    return _add_invoices
+
+@pytest.fixture
+def assert_row(tuple_cursor):
+    """Assert the row with row_id in table has exactly the expected column values."""
+    def _assert_row(table: str, row_id: int, expected: dict) -> None:
+        query = f"SELECT {', '.join(expected)} FROM {table} WHERE id = ?"
+        row = tuple_cursor.execute(query, (row_id,)).fetchone()
+        assert row is not None, f"No row in {table} with id={row_id}"
+        assert dict(zip(expected, row)) == expected
+    return _assert_row
+
+@pytest.fixture
+def row_exists(tuple_cursor):
+    """Existence check that skips materializing the row."""
+    def _row_exists(table: str, row_id: int) -> bool:
+        query = f"SELECT 1 FROM {table} WHERE id = ? LIMIT 1"
+        return tuple_cursor.execute(query, (row_id,)).fetchone() is not None
+    return _row_exists
+
+@pytest.fixture
+def fetch_invoices(cursor):
+    """Fetch several invoices with one IN (...) query; returns {id: row}."""
+    def _fetch_invoices(*invoice_ids: int) -> dict:
+        placeholders = ", ".join("?" * len(invoice_ids))
+        cursor.execute(f"SELECT * FROM invoices WHERE id IN ({placeholders})", invoice_ids)
+        return {row["id"]: row for row in cursor.fetchall()}
+    return _fetch_invoices
+
 @pytest.fixture
 def customer_john(cursor):
     return customers.create_customer(cursor, "John", "john@test.com")
@@ -52,59 +100,31 @@ def invoice_alice(cursor, customer_alice):
         )
 
 @pytest.fixture
-def invoice_query_data(cursor, customer_john, customer_alice):
+def invoice_query_data(cursor, add_invoices, customer_john, customer_alice):
     today = date.today().isoformat()
     future = (date.today() + timedelta(days=30)).isoformat()
 
-    invoice_john_draft = invoices.add_invoice_to_customer(
-            cursor, 
-            customer_id=customer_john, 
-            total=100.00, 
-            date_issued=today,
-            date_due=future, 
-            status="draft",
-    )
-
-    invoice_john_sent = invoices.add_invoice_to_customer(
-            cursor, 
-            customer_id=customer_john, 
-            total=250.00, 
-            date_issued=today,
-            date_due=future,
-            status="draft",
-    )
-
-
-    invoice_alice_paid = invoices.add_invoice_to_customer(
-            cursor, 
-            customer_id=customer_alice, 
-            total=500.00, 
-            date_issued=today,
-            date_due=future,
-            status="draft",
+    (
+        invoice_john_draft,
+        invoice_john_sent,
+        invoice_alice_paid,
+        invoice_alice_void,
+    ) = add_invoices([
+        (customer_john, today, 100.00, future),
+        (customer_john, today, 250.00, future),
+        (customer_alice, today, 500.00, future),
+        (customer_alice, today, 175.00, future),
+    ])
+
+    cursor.executemany(
+        "UPDATE invoices SET status = ? WHERE id = ?",
+        [
+            ("sent", invoice_john_sent),
+            ("paid", invoice_alice_paid),
+            ("void", invoice_alice_void),
+        ],
     )
 
-    invoice_alice_void = invoices.add_invoice_to_customer(
-            cursor,
-            customer_id=customer_alice,
-            total=175.00, 
-            date_issued=today,
-            date_due=future,
-            status="draft",
-    )
-
-    status_updates = [
-        (invoice_john_sent, "sent"),
-        (invoice_alice_paid, "paid"),
-        (invoice_alice_void, "void")
-    ]
-
-    for invoice_id, status in status_updates:
-        cursor.execute(
-            "UPDATE invoices SET status = ? WHERE id = ?",
-            (status, invoice_id),
-        )
-
     return {
         "customers": {
             "john": customer_john,
@@ -119,7 +139,7 @@ def invoice_query_data(cursor, customer_john, customer_alice):
     }
 
 @pytest.fixture
-def invoice_overdue_data(cursor, customer_john, customer_alice):
+def invoice_overdue_data(cursor, add_invoices, customer_john, customer_alice):
     today = date.today()
     issued_date = (today - timedelta(days=30)).isoformat()
 
@@ -127,41 +147,17 @@ def invoice_overdue_data(cursor, customer_john, customer_alice):
     due_today = today.isoformat()
     future_due = (today + timedelta(days=10)).isoformat()
 
-    john_overdue = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=customer_john,
-        total=300,
-        date_issued=issued_date,
-        date_due=past_due,
-        status="draft",
-    )
-
-    john_due_today = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=customer_john,
-        total=200,
-        date_issued=issued_date,
-        date_due=due_today,
-        status="draft",
-    )
-
-    alice_overdue = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=customer_alice,
-        total=500,
-        date_issued=issued_date,
-        date_due=past_due,
-        status="draft",
-    )
-
-    alice_not_overdue = invoices.add_invoice_to_customer(
-        cursor,
-        customer_id=customer_alice,
-        total=400,
-        date_issued=issued_date,
-        date_due=future_due,
-        status="draft",
-    )
+    (
+        john_overdue,
+        john_due_today,
+        alice_overdue,
+        alice_not_overdue,
+    ) = add_invoices([
+        (customer_john, issued_date, 300, past_due),
+        (customer_john, issued_date, 200, due_today),
+        (customer_alice, issued_date, 500, past_due),
+        (customer_alice, issued_date, 400, future_due),
+    ])
 
     cursor.execute(
         "UPDATE invoices SET status = 'sent' WHERE id IN (?,?,?,?)",
@@ -0,0 +1,89 @@
+import sqlite3
+import pytest
+from invoice_db.db import connection, schema
+
+# ---------- Connection Setup ----------
+def test_open_db_applies_pragmas(tmp_path):
+    connect = connection.open_db(str(tmp_path / "test.db"))
+    try:
+        assert connect.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        assert connect.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+        assert connect.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+    finally:
+        connect.close()
+
+def test_open_db_fast_mode(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    connect = connection.open_db(db_path, fast=True)
+    try:
+        assert connect.execute("PRAGMA journal_mode;").fetchone()[0] == "memory"
+        assert connect.execute("PRAGMA synchronous;").fetchone()[0] == 0  # OFF
+        assert connect.execute("PRAGMA locking_mode;").fetchone()[0] == "exclusive"
+    finally:
+        connect.close()
+    assert not (tmp_path / "test.db-wal").exists()
+
+def test_open_db_memory_skips_wal():
+    connect = connection.open_db(":memory:")
+    try:
+        assert connect.execute("PRAGMA journal_mode;").fetchone()[0] == "memory"
+        assert connect.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+    finally:
+        connect.close()
+
+def test_pooled_connection_is_reused(tmp_path):
+    db_file = str(tmp_path / "test.db")
+    try:
+        assert connection.get_pooled_connection(db_file) is connection.get_pooled_connection(db_file)
+    finally:
+        connection.close_pooled_connection(db_file)
+
+def test_db_session_commits_and_rolls_back(tmp_path):
+    db_file = str(tmp_path / "test.db")
+    try:
+        with connection.db_session(db_file) as (connect, cursor):
+            cursor.execute("CREATE TABLE t (x INTEGER)")
+            cursor.execute("INSERT INTO t VALUES (1)")
+        try:
+            with connection.db_session(db_file) as (connect, cursor):
+                cursor.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        with connection.db_session(db_file) as (connect, cursor):
+            rows = cursor.execute("SELECT x FROM t").fetchall()
+        assert [r['x'] for r in rows] == [1]
+    finally:
+        connection.close_pooled_connection(db_file)
+
+def test_nested_db_session_joins_outer_transaction(tmp_path):
+    db_file = str(tmp_path / "test.db")
+    try:
+        with connection.db_session(db_file) as (connect, cursor):
+            cursor.execute("CREATE TABLE t (x INTEGER)")
+            with connection.db_session(db_file) as (_, inner):
+                inner.execute("INSERT INTO t VALUES (1)")
+            assert connect.in_transaction
+        assert not connect.in_transaction
+        assert connect.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+    finally:
+        connection.close_pooled_connection(db_file)
+
+# ---------- Schema ----------
+def test_create_schema_runs_in_one_transaction():
+    connect = sqlite3.connect(":memory:", isolation_level=None)
+    cursor = connect.cursor()
+    schema.create_schema(cursor)
+    assert not connect.in_transaction
+    names = {r[0] for r in cursor.execute("SELECT name FROM sqlite_master")}
+    assert {"customers", "invoices", "customer_invoice_summary"} <= names
+    connect.close()
+
+def test_run_ddl_rolls_back_on_error():
+    connect = sqlite3.connect(":memory:", isolation_level=None)
+    cursor = connect.cursor()
+    with pytest.raises(sqlite3.OperationalError):
+        schema.run_ddl(cursor, ("CREATE TABLE t (id INTEGER)", "NOT VALID SQL"))
+    assert not connect.in_transaction
+    assert cursor.execute("SELECT name FROM sqlite_master WHERE name = 't'").fetchone() is None
+    connect.close()
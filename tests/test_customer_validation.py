@@ -1,3 +1,4 @@
+import sqlite3
 import pytest
 from invoice_db.db import customers
 
@@ -7,21 +8,27 @@ CUSTOMER_ALICE_NAME = "Alice"
 CUSTOMER_ALICE_EMAIL = "alice@test.com"
 
 # ---------- Customer Validation ----------
-def test_create_customer_empty_name_raises(cursor):
+# Name/email are validated before the cursor is touched, so these need no database.
+def test_create_customer_empty_name_raises():
     with pytest.raises(ValueError):
-        customers.create_customer(cursor, " ", "john@example.com")
+        customers.create_customer(None, " ", "john@example.com")
 
-def test_create_customer_invalid_name_raises(cursor):
+def test_create_customer_invalid_name_raises():
     with pytest.raises(ValueError):
-        customers.create_customer(cursor, "John 2 Doe", "johndoe@example.com")
+        customers.create_customer(None, "John 2 Doe", "johndoe@example.com")
 
-def test_create_customer_empty_email_raises(cursor):
+@pytest.mark.parametrize("name", ["Jo_hn", "Jo[hn", "Jo^hn", "Jo\\hn"])
+def test_create_customer_name_with_symbols_raises(name):
     with pytest.raises(ValueError):
-        customers.create_customer(cursor, "John Doe", " ")
+        customers.create_customer(None, name, "symbol@test.com")
 
-def test_create_customer_invalid_email_raises(cursor):
+def test_create_customer_empty_email_raises():
     with pytest.raises(ValueError):
-        customers.create_customer(cursor, "John Doe", "invalid-email")
+        customers.create_customer(None, "John Doe", " ")
+
+def test_create_customer_invalid_email_raises():
+    with pytest.raises(ValueError):
+        customers.create_customer(None, "John Doe", "invalid-email")
 
 def test_create_customer_duplicate_name_allowed(cursor):
     customer1_id = customers.create_customer(cursor, "John", "first@test.com")
@@ -33,9 +40,42 @@ def test_create_customer_duplicate_email_raises(cursor):
     with pytest.raises(ValueError):
         customers.create_customer(cursor, "John Doe", "same@example.com")
 
+def test_create_customers_bulk_duplicate_email_raises(cursor):
+    with pytest.raises(ValueError, match="Email 'tom@test.com' already exists."):
+        customers.create_customers(cursor, [("Tom", "tom@test.com"), ("Tommy", "TOM@test.com")])
+
+def test_create_customers_bulk_existing_email_names_row_and_inserts_nothing(cursor, tuple_cursor, customer_john):
+    with pytest.raises(ValueError, match=f"Email '{CUSTOMER_JOHN_EMAIL}' already exists."):
+        customers.create_customers(cursor, [("Tom", "tom@test.com"), ("Johnny", CUSTOMER_JOHN_EMAIL.upper())])
+    assert tuple_cursor.execute("SELECT COUNT(*) FROM customers").fetchone() == (1,)
+
+def test_create_customers_bulk_other_integrity_error_is_reraised(cursor):
+    cursor.execute("""
+        CREATE TEMP TRIGGER reject_tom BEFORE INSERT ON customers
+        WHEN NEW.name = 'Tom' BEGIN SELECT RAISE(ABORT, 'rejected'); END
+    """)
+    try:
+        with pytest.raises(sqlite3.IntegrityError, match="rejected"):
+            customers.create_customers(cursor, [("Ann", "ann@test.com"), ("Tom", "tom@test.com")])
+    finally:
+        cursor.execute("DROP TRIGGER reject_tom")
+
 def test_update_customer_duplicate_email_raises(cursor, customer_john, customer_alice):
     with pytest.raises(ValueError):
         customers.update_customer(cursor, customer_alice, email=CUSTOMER_JOHN_EMAIL)
 
 def test_delete_customer_invalid_id_returns_false(cursor):
-    assert not customers.delete_customer(cursor, -9999)
\ No newline at end of file
+    assert not customers.delete_customer(cursor, -9999)
+
+def test_update_customer_duplicate_email_different_case_raises(cursor, customer_john, customer_alice):
+    with pytest.raises(ValueError):
+        customers.update_customer(cursor, customer_alice, email="  JOHN@test.com ")
+
+def test_update_customer_keeps_own_email(cursor, customer_john):
+    updated = customers.update_customer(cursor, customer_john, name="Johnny", email=CUSTOMER_JOHN_EMAIL.upper())
+    assert updated['email'] == CUSTOMER_JOHN_EMAIL
+
+def test_create_customer_duplicate_email_leaves_one_row(cursor, tuple_cursor, customer_john):
+    with pytest.raises(ValueError, match="already exists"):
+        customers.create_customer(cursor, "Other", CUSTOMER_JOHN_EMAIL)
+    assert tuple_cursor.execute("SELECT COUNT(*) FROM customers").fetchone() == (1,)
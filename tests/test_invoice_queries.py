@@ -1,6 +1,26 @@
 import pytest
 from invoice_db.db import invoices
 
+# ----------- INVOICE Index Tests -----------
+
+def test_customer_invoice_listing_uses_customer_date_index(cursor):
+    cursor.execute("""
+    EXPLAIN QUERY PLAN
+    SELECT id, customer_id, date_issued, date_due, total, created_at, updated_at, status
+    FROM invoices
+    WHERE customer_id = ?
+    ORDER BY date_issued DESC, id DESC
+    """, (1,))
+    plan = " ".join(row[3] for row in cursor.fetchall())
+    assert "idx_invoices_customer_date" in plan
+    assert "USE TEMP B-TREE" not in plan
+
+def test_invoice_indexes_have_no_redundant_customer_prefix(tuple_cursor):
+    indexes = {r[0] for r in tuple_cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'invoices' AND sql IS NOT NULL"
+    )}
+    assert indexes == {"idx_invoices_customer_date", "idx_invoices_date_issued", "idx_invoices_date_due", "idx_invoices_status_due"}
+
 # ----------- INVOICE Count Tests -----------
 
 def test_count_all_invoices(cursor, invoice_query_data):
@@ -26,6 +46,14 @@ def test_count_invoices_filter_by_max_total(cursor, invoice_query_data):
     invoice_count = invoices.count_invoices(cursor, max_total=250)
     assert invoice_count == 3
 
+def test_count_invoices_empty_db_returns_zero(cursor):
+    assert invoices.count_invoices(cursor) == 0
+
+def test_sum_invoices_by_customer(cursor, invoice_query_data):
+    john_id = invoice_query_data['customers']['john']
+    assert invoices.sum_invoices_by_customer(cursor, john_id) == 35000
+    assert invoices.sum_invoices_by_customer(cursor, -1) == 0
+
 def test_count_invoices_filters_by_multiple_values(cursor, invoice_query_data):
     alice_id = invoice_query_data['customers']['alice']
     invoice_count = invoices.count_invoices(cursor, customer_id=alice_id, status="paid", min_total=100.00)
@@ -37,6 +65,11 @@ def test_list_invoices_returns_all(cursor, invoice_john, invoice_alice):
     found_ids = set(row['id'] for row in result)
     assert found_ids == {invoice_john, invoice_alice}
 
+def test_list_invoices_includes_customer_name(cursor, invoice_john, invoice_alice):
+    result = invoices.list_invoices(cursor)
+    names = {row['id']: row['customer_name'] for row in result}
+    assert names == {invoice_john: "John", invoice_alice: "Alice"}
+
 def test_list_invoices_empty_db_returns_empty_list(cursor):
     result = invoices.list_invoices(cursor)
     assert result == []
@@ -84,7 +117,7 @@ def test_list_invoices_applies_offset(cursor, invoice_query_data):
     assert len(results) == 3
 
 # TODO: Break this down into seperate tests
-@pytest.mark.parametrize("sort_by", ["id", "date_issued", "total", "status"])
+@pytest.mark.parametrize("sort_by", ["id", "date_issued", "date_due", "total", "status", "created_at"])
 def test_invoices_list_accepts_valid_sort_by_values(cursor, sort_by, invoice_query_data):
     results = invoices.list_invoices(cursor, sort_by=sort_by)
     assert len(results) == 4
@@ -1,3 +1,4 @@
+import sqlite3
 import pytest
 from datetime import date, timedelta
 from invoice_db.db import invoices
@@ -11,33 +12,51 @@ def test_create_invoice_invalid_customer_raises(cursor):
     with pytest.raises(ValueError):
         invoices.add_invoice_to_customer(cursor, INVALID_CUSTOMER_ID, "1/1/2025", 100.25)
 
-def test_create_invoice_invalid_date_issued_raises(cursor, customer_john):
+def test_bulk_add_invoices_invalid_customer_raises(cursor, customer_john):
     with pytest.raises(ValueError):
-        invoices.add_invoice_to_customer(cursor, customer_john, "invalid-date", 0)
-
-def test_create_invoice_negative_total_raises(cursor, customer_john):
-    with pytest.raises(ValueError):
-        invoices.add_invoice_to_customer(cursor, customer_john, "2/18/2025", NEGATIVE_TOTAL)
-
-def test_create_invoice_non_numeric_total_raises(cursor, customer_john):
-    with pytest.raises(ValueError):
-        invoices.add_invoice_to_customer(cursor, customer_john, "2/18/2025", "Test")
-
-def test_update_invoice_invalid_date_issued_raises(cursor, invoice_john):
+        invoices.bulk_add_invoices(cursor, [(customer_john, None, 10, None), (INVALID_CUSTOMER_ID, None, 10, None)])
+
+def test_bulk_add_invoices_checks_customers_in_chunks(db, cursor, customer_john):
+    # Older SQLite builds cap bound parameters at 999.
+    previous = db.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    try:
+        rows = [(customer_john, None, 10, None)] + [(INVALID_CUSTOMER_ID + i, None, 10, None) for i in range(1000)]
+        with pytest.raises(ValueError, match=f"Customer not found \\(id={INVALID_CUSTOMER_ID}\\)"):
+            invoices.bulk_add_invoices(cursor, rows)
+    finally:
+        db.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, previous)
+
+@pytest.mark.parametrize("date_issued, total", [
+    ("invalid-date", 0),
+    ("2/18/2025", NEGATIVE_TOTAL),
+    ("2/18/2025", "Test"),
+    ("2/18/2025", float("inf")),
+    ("2/18/2025", "nan"),
+], ids=["invalid_date_issued", "negative_total", "non_numeric_total", "infinite_total", "nan_total"])
+def test_create_invoice_invalid_values_raise(cursor, customer_john, date_issued, total):
     with pytest.raises(ValueError):
-        invoices.update_invoice(cursor, invoice_john, date_issued="invalid-date")
-
-def test_update_invoice_invalid_date_due_raises(cursor, invoice_john):
+        invoices.add_invoice_to_customer(cursor, customer_john, date_issued, total)
+
+@pytest.mark.parametrize("changes", [
+    {"date_issued": "invalid-date"},
+    {"date_due": "invalid-date"},
+    {"total": NEGATIVE_TOTAL},
+    {"customer_id": INVALID_CUSTOMER_ID},
+], ids=["invalid_date_issued", "invalid_date_due", "negative_total", "invalid_customer_id"])
+def test_update_invoice_invalid_values_raise(cursor, invoice_john, changes):
     with pytest.raises(ValueError):
-        invoices.update_invoice(cursor, invoice_john, date_due="invalid-date")
+        invoices.update_invoice(cursor, invoice_john, **changes)
 
-def test_update_invoice_negative_total_raises(cursor, invoice_john):
-    with pytest.raises(ValueError):
-        invoices.update_invoice(cursor, invoice_john, total=NEGATIVE_TOTAL)
+def test_invalid_customer_foreign_key_reports_customer_not_found(cursor, invoice_john):
+    with pytest.raises(ValueError, match=f"Customer not found \\(id={INVALID_CUSTOMER_ID}\\)"):
+        invoices.add_invoice_to_customer(cursor, INVALID_CUSTOMER_ID, "1/1/2025", 100.25)
+    with pytest.raises(ValueError, match="Customer not found"):
+        invoices.update_invoice(cursor, invoice_john, customer_id=INVALID_CUSTOMER_ID)
+    assert invoices.get_invoice_by_id(cursor, invoice_john)['customer_id'] != INVALID_CUSTOMER_ID
 
-def test_update_invoice_invalid_customer_id_raises(cursor, invoice_john):
+def test_bulk_update_invoice_totals_negative_total_raises(cursor, invoice_john):
     with pytest.raises(ValueError):
-        invoices.update_invoice(cursor, invoice_john, customer_id=INVALID_CUSTOMER_ID)
+        invoices.bulk_update_invoice_totals(cursor, {invoice_john: NEGATIVE_TOTAL})
 
 def test_delete_invalid_invoice_id_returns_false(cursor):
     assert not invoices.delete_invoice(cursor, INVALID_INVOICE_ID)
@@ -5,30 +5,45 @@ import pytest
 CUSTOMER_JOHN_EMAIL = "john@test.com"
 
 # ---------- Invoice CRUD Tests ----------
-def test_create_invoice(cursor, customer_john):
+def test_create_invoice(cursor, assert_row, customer_john):
     invoice_id = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    row = cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,)).fetchone()
 
-    assert row is not None
-    assert row['id'] == invoice_id
-    assert row['customer_id'] == customer_john
-    assert row['date_issued'] == "2025-01-20"
-    assert row['total'] == 30025
-    assert row["date_due"] is None
+    assert_row("invoices", invoice_id, {
+        "customer_id": customer_john,
+        "date_issued": "2025-01-20",
+        "total": 30025,
+        "date_due": None,
+    })
+
+def test_bulk_add_invoices(cursor, tuple_cursor, customer_john, customer_alice):
+    created = invoices.bulk_add_invoices(cursor, [
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_alice, "2025-02-17", 100, "3/1/2025"),
+    ])
+    rows = tuple_cursor.execute("SELECT customer_id, date_issued, date_due, total, status FROM invoices ORDER BY id").fetchall()
+
+    assert created == 2
+    assert rows == [
+        (customer_john, "2025-01-20", None, 30025, "draft"),
+        (customer_alice, "2025-02-17", "2025-03-01", 10000, "draft"),
+    ]
 
 def test_get_invoice_by_id(cursor, invoice_john):
     row = invoices.get_invoice_by_id(cursor, invoice_john)
     assert row['id'] == invoice_john
 
-def test_get_invoices_by_email(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_get_invoices_by_email(cursor, add_invoices, customer_john):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
     rows = invoices.get_invoices_by_email(cursor, CUSTOMER_JOHN_EMAIL)
 
     assert len(rows) == 2
 
-    invoice_1 = next((i for i in rows if i['id'] == invoice_id_1), None)
-    invoice_2 = next((i for i in rows if i['id'] == invoice_id_2), None)
+    by_id = {r['id']: r for r in rows}
+    invoice_1 = by_id.get(invoice_id_1)
+    invoice_2 = by_id.get(invoice_id_2)
     
     assert invoice_1 is not None
     assert invoice_2 is not None
@@ -37,9 +52,11 @@ def test_get_invoices_by_email(cursor, customer_john):
     assert invoice_1["id"] == invoice_id_1
     assert invoice_2["id"] == invoice_id_2
 
-def test_get_invoices_by_customer_id(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_get_invoices_by_customer_id(cursor, add_invoices, customer_john):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
     rows = invoices.get_invoices_by_customer_id(cursor, customer_john)
 
     assert len(rows) == 2
@@ -47,10 +64,12 @@ def test_get_invoices_by_customer_id(cursor, customer_john):
     customer_ids = {r["customer_id"] for r in rows}
     assert customer_ids == {customer_john}
 
-def test_get_invoices_by_customer_and_range_inclusive(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
-    invoice_id_3 = invoices.add_invoice_to_customer(cursor, customer_john, "6/5/2025", 1000.01)
+def test_get_invoices_by_customer_and_range_inclusive(cursor, add_invoices, customer_john):
+    invoice_id_1, invoice_id_2, invoice_id_3 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+        (customer_john, "6/5/2025", 1000.01, None),
+    ])
 
     start_date = "2/17/2025"
     end_date = "6/5/2025"
@@ -58,9 +77,10 @@ def test_get_invoices_by_customer_and_range_inclusive(cursor, customer_john):
 
     assert len(rows) == 2
 
-    invoice_1 = next((i for i in rows if i['id'] == invoice_id_1), None)
-    invoice_2 = next((i for i in rows if i['id'] == invoice_id_2), None)
-    invoice_3 = next((i for i in rows if i['id'] == invoice_id_3), None)
+    by_id = {r['id']: r for r in rows}
+    invoice_1 = by_id.get(invoice_id_1)
+    invoice_2 = by_id.get(invoice_id_2)
+    invoice_3 = by_id.get(invoice_id_3)
 
     
     assert invoice_1 is None
@@ -92,18 +112,16 @@ def test_valid_transition_draft_to_sent_autofills_date_issued_and_date_due(curso
     result = invoices.set_invoice_status(cursor, invoice_id=invoice_id, status="sent")
     updated_invoice = invoices.get_invoice_by_id(cursor, invoice_id=invoice_id)
     assert result is True
-    assert updated_invoice['status'] == "sent"
-    assert updated_invoice['date_issued'] == date.today().isoformat()
-    assert updated_invoice['date_due'] == (date.today() + timedelta(days=30)).isoformat()
+    assert (updated_invoice['status'], updated_invoice['date_issued'], updated_invoice['date_due']) == (
+        "sent", date.today().isoformat(), (date.today() + timedelta(days=30)).isoformat(),
+    )
 
 def test_draft_to_sent_keeps_valid_existing_dates(cursor, customer_john):
     invoice_id = invoices.add_invoice_to_customer(cursor, customer_id=customer_john, total=100, date_issued="01/01/2100", date_due="02/01/2100")
     result = invoices.set_invoice_status(cursor, invoice_id=invoice_id, status="sent")
     invoice = invoices.get_invoice_by_id(cursor, invoice_id)
     assert result is True
-    assert invoice['status'] == "sent"
-    assert invoice['date_issued'] == "2100-01-01"
-    assert invoice['date_due'] == "2100-02-01"
+    assert (invoice['status'], invoice['date_issued'], invoice['date_due']) == ("sent", "2100-01-01", "2100-02-01")
 
 
 def test_valid_transistion_sent_to_paid(cursor, invoice_john):
@@ -128,62 +146,84 @@ def test_valid_transistion_paid_to_sent(cursor, invoice_john):
     assert result is True
     assert invoice['status'] == "sent"
 
-def test_update_invoice_date_issued_only(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_update_invoice_date_issued_only(cursor, add_invoices, fetch_invoices, customer_john):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
 
     new_date_issued = "2025-03-08"
     updated = invoices.update_invoice(cursor, invoice_id_1, date_issued=new_date_issued)
     assert updated
 
-    row_1 = invoices.get_invoice_by_id(cursor, invoice_id_1)
-    row_2 = invoices.get_invoice_by_id(cursor, invoice_id_2)
+    rows = fetch_invoices(invoice_id_1, invoice_id_2)
+    row_1, row_2 = rows[invoice_id_1], rows[invoice_id_2]
 
     assert row_1["date_issued"] == new_date_issued
     assert row_2["date_issued"] != new_date_issued
 
-def test_update_invoice_total_and_customer(cursor, customer_john, customer_alice):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_update_invoice_total_and_customer(cursor, add_invoices, fetch_invoices, customer_john, customer_alice):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
 
     new_total = 1500.90
+    new_total_cents = utils.to_cents(new_total)
     updated = invoices.update_invoice(cursor, invoice_id_2, total=new_total, customer_id=customer_alice)
     assert updated
 
-    row_1 = invoices.get_invoice_by_id(cursor, invoice_id_1)
-    row_2 = invoices.get_invoice_by_id(cursor, invoice_id_2)
+    rows = fetch_invoices(invoice_id_1, invoice_id_2)
+    row_1, row_2 = rows[invoice_id_1], rows[invoice_id_2]
 
     assert row_1["customer_id"] == customer_john
-    assert row_1["total"] != utils.to_cents(new_total)
-    assert row_2["customer_id"] == customer_alice
-    assert row_2["total"] == utils.to_cents(new_total)
+    assert row_1["total"] != new_total_cents
+    assert (row_2["customer_id"], row_2["total"]) == (customer_alice, new_total_cents)
     
 
-def test_update_invoice_no_fields_returns_false(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_update_invoice_returns_updated_row(cursor, invoice_john):
+    row = invoices.update_invoice(cursor, invoice_john, total=42.50)
+    assert (row['id'], row['total']) == (invoice_john, 4250)
+
+def test_update_invoice_total_to_zero(cursor, invoice_john):
+    row = invoices.update_invoice(cursor, invoice_john, total=0)
+    assert (row['id'], row['total']) == (invoice_john, 0)
+
+def test_update_invoice_unchanged_values_returns_none(cursor, invoice_john, customer_john):
+    assert invoices.update_invoice(cursor, invoice_john, total=1234.00, customer_id=customer_john) is None
+
+def test_bulk_update_invoice_totals(cursor, fetch_invoices, invoice_john, invoice_alice):
+    updated = invoices.bulk_update_invoice_totals(cursor, {invoice_john: 10.50, invoice_alice: 20})
+    rows = fetch_invoices(invoice_john, invoice_alice)
+
+    assert updated == 2
+    assert rows[invoice_john]["total"] == 1050
+    assert rows[invoice_alice]["total"] == 2000
+
+def test_update_invoice_no_fields_returns_false(cursor, add_invoices, customer_john):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
 
     updated = invoices.update_invoice(cursor, invoice_id_1)
     assert not updated
 
-def test_delete_invoice(cursor, customer_john):
-    invoice_id_1 = invoices.add_invoice_to_customer(cursor, customer_john, "1/20/2025", 300.25)
-    invoice_id_2 = invoices.add_invoice_to_customer(cursor, customer_john, "2/17/2025", 100)
+def test_delete_invoice(cursor, add_invoices, row_exists, customer_john):
+    invoice_id_1, invoice_id_2 = add_invoices([
+        (customer_john, "1/20/2025", 300.25, None),
+        (customer_john, "2/17/2025", 100, None),
+    ])
 
     deleted = invoices.delete_invoice(cursor, invoice_id_1)
     assert deleted
 
-    remaining = invoices.get_invoices_by_customer_id(cursor, customer_john)
-    remaining_ids = {r["id"] for r in remaining}
-    assert invoice_id_1 not in remaining_ids
-    assert invoice_id_2 in remaining_ids
+    assert not row_exists("invoices", invoice_id_1)
+    assert row_exists("invoices", invoice_id_2)
 
-def test_delete_customer_cascades_invoices(cursor, customer_john, invoice_john):
+def test_delete_customer_cascades_invoices(cursor, row_exists, customer_john, invoice_john):
     deleted_customer = customers.delete_customer(cursor, customer_john)
     assert deleted_customer
 
-    cascaded_invoices = invoices.get_invoices_by_customer_id(cursor, customer_john)
-    assert cascaded_invoices == []
-
-    row = customers.get_customer_by_id(cursor, customer_john)
-    assert row is None
\ No newline at end of file
+    assert not row_exists("invoices", invoice_john)
+    assert not row_exists("customers", customer_john)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import pytest
+from invoice_db.db import utils
+
+# ---------- Formatting ----------
+@pytest.mark.parametrize("cents, expected", [
+    (0, "$0.00"),
+    (5, "$0.05"),
+    (100, "$1.00"),
+    (35025, "$350.25"),
+    (-350, "$-3.50"),
+])
+def test_fmt_dollars(cents, expected):
+    assert utils.fmt_dollars(cents) == expected
+
+def test_fmt_dollars_accepts_float_cents():
+    assert utils.fmt_dollars(5) == "$0.05"
+    assert utils.fmt_dollars(5.0) == "$0.05"
+    assert utils.fmt_dollars(35025.0) == "$350.25"
+
+def test_fmt_optional_uses_empty_placeholder():
+    assert utils.fmt_optional(None) == "-"
+    assert utils.fmt_optional(None, "n/a") == "n/a"
+    assert utils.fmt_optional("2025-01-20", "n/a") == "2025-01-20"
+
+# ---------- Parsing ----------
+@pytest.mark.parametrize("amount, expected", [
+    (12, 1200),
+    (12.34, 1234),
+    ("12.34", 1234),
+    (0.005, 1),
+    (0.0049, 0),
+    ("-12.345", -1235),
+    (".5", 50),
+    ("7.", 700),
+    ("1e2", 10000),
+    (1500.90, 150090),
+])
+def test_to_cents(amount, expected):
+    assert utils.to_cents(amount) == expected
+
+@pytest.mark.parametrize("date_str", ["01-20-2025", "01/20/2025", "1/20/2025", "2025-01-20", "2025-1-20", " 2025-01-20 "])
+def test_to_iso_accepted_formats(date_str):
+    assert utils.to_iso(date_str) == "2025-01-20"
+
+def test_to_iso_empty_returns_none():
+    assert utils.to_iso(None) is None
+    assert utils.to_iso("") is None
+
+@pytest.mark.parametrize("date_str", ["02/30/2025", "2025-13-01", "01-20/2025", "20250120", "2025/01/20"])
+def test_to_iso_rejects_invalid_dates(date_str):
+    with pytest.raises(ValueError):
+        utils.to_iso(date_str)
+
+def test_to_iso_invalid_raises_every_call():
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            utils.to_iso("invalid-date")
+
+def test_build_update_sql_is_cached_per_column_set():
+    sql = utils.build_update_sql("customers", ("name", "email"))
+    assert sql == (
+        "UPDATE customers SET name = ?, email = ?, "
+        "updated_at = datetime('now', 'localtime') WHERE id = ?"
+    )
+    assert utils.build_update_sql("customers", ("name", "email")) is sql
+    assert utils.build_update_sql("customers", ("name",), True).endswith("WHERE id = ? RETURNING *")